@@ -4,6 +4,9 @@ from typing import Optional
 class Settings(BaseSettings):
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "contract_intelligence"
+    mongodb_max_pool_size: int = 200
+    mongodb_min_pool_size: int = 20
+    mongodb_wait_queue_timeout_ms: int = 2000
     
     llama_api_key: Optional[str] = None           
     huggingface_api_key: Optional[str] = None     
@@ -11,10 +14,16 @@ class Settings(BaseSettings):
     upload_directory: str = "uploads"
     max_file_size: int = 50 * 1024 * 1024  # 50MB
     processing_timeout: int = 300
+    extraction_workers: Optional[int] = None  # defaults to the CPU count
+    pdf_max_pages: Optional[int] = None  # no cap by default
+    pdf_early_stop: bool = False  # stop reading once every section anchor is seen
     
     huggingface_model: str = "meta-llama/Llama-3.1-8B-Instruct"
+    huggingface_max_concurrency: int = 5
+    huggingface_cache_ttl: int = 24 * 3600  # seconds; 0 disables the cache
     
     redis_url: str = "redis://localhost:6379"
+    redis_timeout: float = 0.5  # seconds, for both connecting and each command
 
     class Config:
         env_file = ".env"
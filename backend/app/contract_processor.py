@@ -1,26 +1,800 @@
+import ahocorasick
+import asyncio
+import bisect
+import codecs
+import multiprocessing
+import fitz
+import hashlib
+import httpx
 import PyPDF2
 import re
+import re2
 import json
-import requests
-from typing import Dict, List, Any, Optional
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-from .database import get_database
-from .models import ExtractedData, Gap
+from .database import get_database, set_contract_progress, get_cached_result, set_cached_result
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+# Keep text that overflows the page box; PyPDF2 never clipped it either
+_PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_MEDIABOX_CLIP
+
+def _non_ascii_to_space(error):
+    """Codec error handler that replaces each run of non-ASCII characters with a space"""
+    return ' ', error.end
+
+_ASCII_SPACE = "contract_processor.ascii_space"
+codecs.register_error(_ASCII_SPACE, _non_ascii_to_space)
+
+def _compile(pattern, flags=0):
+    """Compile a document-scanning pattern with RE2's linear-time engine.
+
+    Falls back to stdlib re for syntax RE2 rejects (e.g. backreferences).
+    Only re.IGNORECASE and re.MULTILINE are translated.
+    """
+    options = re2.Options()
+    options.log_errors = False
+    options.case_sensitive = not flags & re.IGNORECASE
+    try:
+        return re2.compile(f"(?m){pattern}" if flags & re.MULTILINE else pattern, options)
+    except re2.error:
+        return re.compile(pattern, flags)
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    """Start the worker processes for the section extractors on first use.
+
+    Workers are spawned rather than forked so they never inherit the event
+    loop, Motor's threads or locks held by them.
+    """
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ProcessPoolExecutor(
+            max_workers=settings.extraction_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _extraction_pool
+
+def _discard_extraction_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next call starts fresh workers"""
+    global _extraction_pool
+    if _extraction_pool is pool:
+        _extraction_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_extraction_pool():
+    """Stop the extraction worker processes, if they were started"""
+    if _extraction_pool is not None:
+        _discard_extraction_pool(_extraction_pool)
+
+async def _run_extractors(calls) -> List[Any]:
+    """Run (extractor, text) calls side by side in the extraction pool.
+
+    A worker that dies (e.g. killed for memory) breaks the whole pool, so
+    the pool is replaced and the calls retried once before giving up.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = _get_extraction_pool()
+        try:
+            return await asyncio.gather(
+                *(loop.run_in_executor(pool, extractor, text) for extractor, text in calls)
+            )
+        except BrokenProcessPool:
+            _discard_extraction_pool(pool)
+            if attempt:
+                raise
+            logger.warning("Extraction worker pool is broken, restarting it")
+
+def _fuse(patterns, flags=0):
+    """Join patterns into one named alternation so the text is scanned only once"""
+    return _compile("|".join(f"(?P<g{i}>{p})" for i, p in enumerate(patterns)), flags)
+
+def _fused_group(match):
+    """Return (alternative index, capture group number) for a match of a fused pattern"""
+    name = match.lastgroup
+    return int(name[1:]), match.re.groupindex[name] + 1
+
+def _fused_capture(match):
+    """Return (alternative index, captured text) for a match of a fused pattern"""
+    index, group = _fused_group(match)
+    return index, match.group(group)
+
+def _automaton(words):
+    """Build an Aho-Corasick automaton that reports each word it finds"""
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+def _file_digest(file_path: str) -> str:
+    """BLAKE2b digest of a file's bytes, used to recognise duplicate uploads"""
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+def _empty_extracted_data() -> Dict[str, Any]:
+    """Plain-dict form of an empty ExtractedData, as stored in MongoDB"""
+    return {
+        "parties": [],
+        "account_info": None,
+        "financial_details": None,
+        "payment_structure": None,
+        "revenue_classification": None,
+        "sla": None,
+        "confidence_scores": {},
+    }
+
+# Regex patterns are compiled once at import time and shared by every contract.
+# Patterns that scan the whole document go through RE2 so pathological input
+# cannot trigger catastrophic backtracking; cleanup and short-string checks
+# produce many tiny matches and stay on stdlib re, which is faster there.
+#
+# Keyword patterns are written in lowercase and run case-sensitively against a
+# lowercased copy of the text that is computed once per extractor. Cleaned
+# text is ASCII, so match offsets in the lowercased copy index the original
+# text too, which is sliced wherever the original casing is kept. Patterns
+# that capture names keep re.IGNORECASE and run against the original text.
+
+# Text cleanup
+_WS_RE = re.compile(r'\s+')
+
+# Characters of cleaned text the extractors scan, bounding worst-case latency
+_MAX_SCAN = 1_000_000
+
+# Section anchors checked page by page while streaming a PDF when
+# PDF_EARLY_STOP is enabled. Once every section, including the signature
+# block, has been seen, the remaining pages are not read. Anchors only prove
+# a section is present, so this is opt-in: pricing exhibits after the
+# signature block can still hold the contract total or payment methods.
+_REQUIRED_SECTIONS = (
+    r'(?-i:\b(?:Inc\.|LLC|Corp\.|Corporation|Ltd\.|Limited)\b)',          # parties
+    r'total[^$\n]{0,40}\$\s*\d',                                               # contract total
+    r'payment\s+terms|\bnet\s+\d+',                                          # payment structure
+    r'service\s+level|\bSLA\b|uptime|response\s+time',                       # SLA
+    r'account\s+information|billing\s+contact',                               # account info
+    r'in\s+witness\s+whereof|signatures?\s*:|\bwitness\s*:',                  # signature block
+)
+_REQUIRED_SECTIONS_RE = _fuse(_REQUIRED_SECTIONS, re.IGNORECASE)
+_ALL_SECTIONS = (1 << len(_REQUIRED_SECTIONS)) - 1
+
+def _found_sections(page_text: str) -> int:
+    """Bitmask of the required section anchors present in a page"""
+    found = 0
+    for match in _REQUIRED_SECTIONS_RE.finditer(page_text):
+        found |= 1 << int(match.lastgroup[1:])
+        if found == _ALL_SECTIONS:
+            break
+    return found
+
+# Parties
+_COMPANY_PATTERNS = tuple(_compile(p, re.IGNORECASE | re.MULTILINE) for p in [
+    # PARTY A/B specific patterns
+    r'PARTY\s+[AB]:\s*([A-Za-z][a-zA-Z\s&.,\-\']*?(?:Inc\.|LLC|Corp\.|Corporation|Company|Ltd\.|Limited))',
+
+    # Any line that ends with corporate suffix
+    r'\b([A-Za-z][a-zA-Z\s&.,\-\']{3,40}?(?:Inc\.|LLC|Corp\.|Corporation|Company|Ltd\.|Limited))\b',
+])
+_TRAILING_COMMA_RE = re.compile(r',$')
+_PARTY_NAME_STOPLIST = frozenset({
+    'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for',
+    'legal entity', 'entity', 'delaware corporation', 'limited liability company'
+})
+_DIGITS_ONLY_RE = re.compile(r'^\d+$')
+_COMPANY_SUFFIX_RE = re.compile(r'\b(?:Inc\.?|LLC|Corp\.?|Corporation|Company|Ltd\.?|Limited)\b', re.IGNORECASE)
+_STATE_CORPORATION_RE = re.compile(r'^(?:Delaware|California|New York|Nevada)\s+Corporation$', re.IGNORECASE)
+_LLC_NAME_RE = re.compile(r'^Limited Liability Company$', re.IGNORECASE)
+_CORPORATION_RE = re.compile(r'\b(?:Inc\.?|Corporation|Corp\.?)\b', re.IGNORECASE)
+_LLC_RE = re.compile(r'\bLLC\b', re.IGNORECASE)
+_LIMITED_RE = re.compile(r'\b(?:Ltd\.?|Limited)\b', re.IGNORECASE)
+_SIGNATORY_PATTERNS = tuple(_compile(p, re.IGNORECASE) for p in [
+    r'(?:Signed|Signature|By):\s*([A-Z][a-zA-Z\s\.]{3,30})',
+    r'([A-Z][a-zA-Z\s\.]{3,30}),?\s+(?:CEO|CFO|President|Vice President|Director|Manager)',
+    r'(?:CEO|CFO|President|Vice President|Director|Manager):\s*([A-Z][a-zA-Z\s\.]{3,30})'
+])
+
+# Financial details
+_CURRENCY_PATTERNS = tuple((_compile(p), code) for p, code in [
+    (r'\$', 'USD'),
+    (r'usd|us\$|us dollar', 'USD'),
+    (r'cad|ca\$|canadian dollar', 'CAD'),
+    (r'eur|€|euro', 'EUR'),
+    (r'gbp|£|british pound', 'GBP'),
+    (r'aud|au\$|australian dollar', 'AUD'),
+    (r'jpy|¥|japanese yen', 'JPY')
+])
+_MONEY_RE = _fuse([
+    r'(?:usd|cad|eur|gbp|aud)\s*([\d,]+\.?\d*)',
+    r'\$\s*([\d,]+\.?\d*)',
+    r'€\s*([\d,]+\.?\d*)',
+    r'£\s*([\d,]+\.?\d*)',
+    r'(?:total|amount|sum|fee|cost|price|value|payment)\s*[:\s]*(?:usd|cad|eur|gbp|aud)?\s*\$?\s*([\d,]+\.?\d*)',
+    r'(?:monthly|annual|yearly)\s*(?:fee|cost|payment)\s*[:\s]*\$?\s*([\d,]+\.?\d*)',
+    r'(?:contract|agreement)\s*(?:value|amount|total)\s*[:\s]*\$?\s*([\d,]+\.?\d*)',
+    r'\$\s*([\d,]+\.?\d*)\s*(?:usd|cad|eur|gbp)?',
+])
+# Keywords marking an amount as the contract total, found in one automaton pass
+_TOTAL_AC = _automaton([
+    'total', 'sum', 'amount', 'contract value', 'total value',
+    'grand total', 'final amount', 'total cost', 'total price'
+])
+
+def _indicator_spans(text_lower: str):
+    """Sorted (start, end) spans of every total indicator in the text"""
+    return sorted((end + 1 - len(word), end + 1) for end, word in _TOTAL_AC.iter(text_lower))
+
+def _span_has_indicator(spans, starts, lo: int, hi: int) -> bool:
+    """Whether an indicator span lies entirely within text[lo:hi]"""
+    i = bisect.bisect_left(starts, lo)
+    while i < len(spans) and spans[i][0] < hi:
+        if spans[i][1] <= hi:
+            return True
+        i += 1
+    return False
+
+_LINE_ITEM_PATTERNS = tuple(_compile(p, re.IGNORECASE | re.MULTILINE) for p in [
+    r'(?:^|\n)\s*[-•*]\s*([^:]+?):\s*\$?\s*([\d,]+\.?\d*)',
+    r'(?:^|\n)\s*(\d+\.?\d*)\.\s*([^:]+?)\s*[-:]\s*\$?\s*([\d,]+\.?\d*)',
+    r'([A-Za-z][^:]{5,30})\s*[-:]\s*(?:Quantity|Qty):\s*(\d+)\s*[-:]\s*(?:Unit Price|Price):\s*\$?\s*([\d,]+\.?\d*)\s*[-:]\s*(?:Total):\s*\$?\s*([\d,]+\.?\d*)',
+])
+_TAX_PATTERNS = tuple(_compile(p) for p in [
+    r'(?:tax|vat|gst|hst)\s*[:\s]*(\d+\.?\d*)\s*%',
+    r'(?:tax|vat|gst|hst)\s*[:\s]*\$?\s*([\d,]+\.?\d*)',
+    r'(?:plus|including|excluding)\s*(?:tax|vat|gst|hst)'
+])
+
+# Payment structure
+# Payment details sit near one of these words; the term, method and banking
+# patterns only scan the merged windows from 100 characters before to 500
+# after each anchor. Every alternative of those patterns contains an anchor
+# word, so only a match running more than 500 characters past its anchor
+# can be cut short. Schedules and due dates can appear without any payment
+# word, so those patterns scan the whole text.
+_PAYMENT_ANCHOR_RE = _compile(
+    r'pay|terms?\b|net\s+\d|due|invoic|billing|account|acct|routing|aba|bank|method'
+    r'|credit\s+card|wire\s+transfer|ach|check|electronic\s+payment|direct\s+deposit'
+)
+_PAYMENT_WINDOW_BEFORE = 100
+_PAYMENT_WINDOW_AFTER = 500
+
+def _payment_windows(data: bytes) -> List[tuple]:
+    """Merged (start, end) windows around every payment anchor, in text order"""
+    windows = []
+    for match in _PAYMENT_ANCHOR_RE.finditer(data):
+        start = max(0, match.start() - _PAYMENT_WINDOW_BEFORE)
+        end = min(len(data), match.start() + _PAYMENT_WINDOW_AFTER)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+def _finditer_windows(pattern, data: bytes, windows):
+    """Matches of pattern inside each window, in text order.
+
+    Takes bytes: for str input RE2 re-encodes the text and walks it up to
+    pos on every call, so each window would cost the whole document.
+    """
+    for start, end in windows:
+        yield from pattern.finditer(data, start, end)
+
+_PAYMENT_TERMS_PATTERNS = tuple(_compile(p) for p in [
+    r'(?:payment terms?|terms?):\s*(net\s+\d+(?:\s+days?)?)',
+    r'(net\s+\d+(?:\s+days?)?)',
+    r'payment[\s\w]*due[\s\w]*(\d+\s+days?)',
+    r'(\d+\s+days?\s*from\s*invoice)',
+    r'due\s*(?:in|within)?\s*(\d+\s*days?)',
+    r'payment\s*within\s*(\d+\s*days?)',
+])
+# "ach" and "check" need word boundaries, or "each" and "checklist" match
+_PAYMENT_METHOD_RE = _fuse([
+    r'(?:payment methods?|methods?|pay by):\s*([^.]+)',
+    r'(?:via|through|by)\s*(credit card|wire transfer|\bach\b|\bchecks?\b|bank transfer|electronic payment|direct deposit|paypal)',
+    r'(credit card|wire transfer|\bach\b|\bchecks?\b|bank transfer|electronic payment|direct deposit|paypal)',
+])
+_METHOD_SPLIT_RE = re.compile(r'[,;/&]|\sand\s|\sor\s')
+# Canonical payment methods in priority order, with the keywords that must all
+# appear in a method phrase; one automaton pass finds every keyword present
+_METHOD_RULES = (
+    (('credit', 'card'), "Credit Card"),
+    (('wire', 'transfer'), "Wire Transfer"),
+    (('ach',), "ACH"),
+    (('check',), "Check"),
+    (('bank', 'transfer'), "Bank Transfer"),
+    (('electronic', 'payment'), "Electronic Payment"),
+    (('direct', 'deposit'), "Direct Deposit"),
+    (('paypal',), "PayPal"),
+)
+_METHOD_AC = _automaton({keyword for keywords, _ in _METHOD_RULES for keyword in keywords})
+# Most phrases are exactly one of the method names the patterns look for
+_METHOD_CANON = {" ".join(required): name for required, name in _METHOD_RULES}
+
+def _canonical_method(method: str) -> str:
+    """Map a lowercase payment method phrase to its canonical name"""
+    name = _METHOD_CANON.get(method)
+    if name:
+        return name
+    keywords = {keyword for _, keyword in _METHOD_AC.iter(method)}
+    for required, name in _METHOD_RULES:
+        if keywords.issuperset(required):
+            return name
+    # Capitalize first letter of each word
+    return method.title()
+_PAYMENT_SCHEDULE_RE = _fuse([
+    r'(monthly|quarterly|annually|yearly|weekly|bi-weekly)\s*(?:payment|billing|invoicing)',
+    r'(?:payment|billing|invoicing)\s*(monthly|quarterly|annually|yearly|weekly|bi-weekly)',
+    r'(monthly|quarterly|annually|yearly|weekly|bi-weekly)\s*basis',
+])
+_DUE_DATE_RE = _fuse([
+    r'due\s*(?:on|by)?\s*(\d{1,2}(?:st|nd|rd|th)?\s*of\s*each\s*month)',
+    r'payment\s*due\s*(\w+\s*\d{1,2},?\s*\d{4})',
+    r'(\d{1,2}/\d{1,2}/\d{4})',
+])
+_BANKING_RE = _fuse([
+    r'(?:account|acct)\s*(?:number|#):\s*([a-z0-9\-]+)',
+    r'(?:routing|aba)\s*(?:number|#):\s*([0-9\-]+)',
+    r'banking details?:\s*([^.]+)',
+])
+
+# Revenue classification
+_RECURRING_PATTERNS = tuple(_compile(p) for p in [
+    r'recurring|subscription|monthly|quarterly|annually|yearly',
+    r'auto.?renew|automatic.?renewal'
+])
+_ONE_TIME_PATTERNS = tuple(_compile(p) for p in [
+    r'one.?time|single payment|lump sum'
+])
+_BILLING_CYCLE_RE = _compile(r'(monthly|quarterly|annually|yearly|weekly)')
+
+# Service level agreement
+_SLA_METRIC_PATTERNS = tuple(_compile(p) for p in [
+    r'(\d+\.?\d*%\s*(?:uptime|availability|performance))',
+    r'((?:uptime|availability):\s*\d+\.?\d*%)',
+    r'(response time[:\s]+(?:maximum\s+)?\d+\s+(?:seconds?|minutes?|hours?))',
+    r'(support response[:\s]+\d+\s+(?:hours?|minutes?))',
+    r'(\d+\s+(?:seconds?|minutes?|hours?)\s+(?:response|support))',
+])
+
+# Account information
+_ACCOUNT_PATTERNS = tuple(_compile(p) for p in [
+    r'account[\s#]*:?\s*([a-z0-9\-]+)',
+    r'customer[\s#]*:?\s*([a-z0-9\-]+)',
+])
+_EMAIL_RE = _compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+_PHONE_PATTERNS = tuple(_compile(p) for p in [
+    r'\((\d{3})\)\s*(\d{3})-?(\d{4})',
+    r'(\d{3})[-.](\d{3})[-.](\d{4})',
+    r'(\d{3})\s+(\d{3})\s+(\d{4})',
+])
+
+# AI response parsing (short generated text, so stdlib re)
+# Up to six capitalised words ending in a legal suffix; the bounded
+# repeats keep matching linear on long or degenerate generated text
+_AI_COMPANY_RE = re.compile(r'\b[A-Z][\w&.-]{1,40}(?:\s+[A-Z][\w&.-]{1,40}){0,5}\s+(?:Company|Corp|Inc|LLC|Ltd)\b')
+_AI_AMOUNT_RE = re.compile(r'\$[\d,]+\.?\d*')
+
+# Text cleanup and section extraction. These are plain functions over the
+# module-level patterns so the process pool can pickle them by reference.
+
+def _clean_extracted_text(text: str) -> str:
+    """Clean and normalize extracted text"""
+    if not text:
+        return ""
+
+    # Replace non-ASCII PDF artifacts with spaces, then collapse whitespace
+    # (including every line break); both steps run in C without the regex engine
+    text = text.encode('ascii', _ASCII_SPACE).decode('ascii')
+
+    return ' '.join(text.split())
+
+def extract_parties(text: str) -> List:
+    """Extract party information using comprehensive regex patterns"""
+    parties = []
+    found_names = set()  # Track found names to avoid duplicates
+
+    # Extract parties using all patterns
+    for pattern in _COMPANY_PATTERNS:
+        try:
+            matches = pattern.findall(text)
+            # Handle tuple results from multiple groups
+            if matches and isinstance(matches[0], tuple):
+                # Flatten tuples from 'between X and Y' pattern
+                flat_matches = []
+                for match_tuple in matches:
+                    for match in match_tuple:
+                        if match.strip():
+                            flat_matches.append(match)
+                matches = flat_matches
+
+            for match in matches:
+                name = match.strip()
+
+                # Clean up the name
+                name = _TRAILING_COMMA_RE.sub('', name)  # Remove trailing comma only
+                name = _WS_RE.sub(' ', name)   # Normalize whitespace
+
+                # Validate the name - more strict validation
+                if (len(name) > 3 and 
+                    len(name) < 80 and 
+                    name not in found_names and
+                    not _DIGITS_ONLY_RE.match(name) and  # Not just numbers
+                    name.lower() not in _PARTY_NAME_STOPLIST and
+                    # Must contain actual company identifiers
+                    _COMPANY_SUFFIX_RE.search(name) and
+                    # Must have a proper company name (not just entity type)
+                    not _STATE_CORPORATION_RE.match(name) and
+                    not _LLC_NAME_RE.match(name)):
+
+                    found_names.add(name)
+
+                    # Determine entity type
+                    entity_type = None
+                    if _CORPORATION_RE.search(name):
+                        entity_type = "Corporation"
+                    elif _LLC_RE.search(name):
+                        entity_type = "Limited Liability Company"
+                    elif _LIMITED_RE.search(name):
+                        entity_type = "Limited Company"
+
+                    parties.append({
+                        "name": name,
+                        "legal_entity": entity_type,
+                        "registration_details": None,
+                        "signatories": [],
+                        "roles": []
+                    })
+        except Exception as e:
+            logger.warning("Error in pattern %s: %s", pattern.pattern, e)
+            continue
+
+    # Look for signatories if we have parties
+    if parties:
+        for pattern in _SIGNATORY_PATTERNS:
+            try:
+                matches = pattern.findall(text)
+                for match in matches:
+                    signatory = match.strip()
+                    if len(signatory) > 3 and len(signatory) < 50:
+                        # Add to first party (can be improved with better matching)
+                        if parties and len(parties[0]["signatories"]) < 3:
+                            parties[0]["signatories"].append(signatory)
+            except Exception as e:
+                continue
+
+    # Remove duplicates while preserving order
+    unique_parties = []
+    seen_names = set()
+    for party in parties:
+        if party["name"] not in seen_names:
+            seen_names.add(party["name"])
+            unique_parties.append(party)
+
+    return unique_parties[:10]  # Limit to 10 parties
+
+def extract_financial_details(text: str) -> Dict:
+    """Extract comprehensive financial information"""
+    text_lower = text.lower()
+    financial_details = {
+        "line_items": [],
+        "total_value": None,
+        "currency": None,
+        "tax_info": None,
+        "additional_fees": []
+    }
+
+
+    for pattern, currency_code in _CURRENCY_PATTERNS:
+        if pattern.search(text_lower):
+            financial_details["currency"] = currency_code
+            break
+
+
+    amount_spans = []
+
+    try:
+        for match in _MONEY_RE.finditer(text_lower):
+            _, amount_str = _fused_capture(match)
+            try:
+                amount = float(amount_str.replace(',', ''))
+                if 0 < amount < 1000000000:  
+                    amount_spans.append((amount, match.start(), match.end()))
+            except ValueError:
+                continue
+    except Exception as e:
+        logger.warning("Error in money patterns: %s", e)
+
+
+    if amount_spans:
+
+        # Find every total indicator in one pass over the document, then
+        # check each amount's 50-character context window by bisecting
+        # the indicator offsets instead of slicing and scanning it
+        indicators = _indicator_spans(text_lower)
+        indicator_starts = [start for start, _ in indicators]
+
+        total_value = None
+
+
+        for amount, start, end in amount_spans:
+            if _span_has_indicator(indicators, indicator_starts, start - 50, end + 50):
+                if not total_value or amount > total_value:
+                    total_value = amount
+
+
+        if not total_value:
+            total_value = max(amount for amount, _, _ in amount_spans)
+
+        financial_details["total_value"] = total_value
+
+
+    for pattern in _LINE_ITEM_PATTERNS:
+        try:
+            matches = pattern.findall(text)
+            for match in matches:
+                try:
+                    if len(match) == 2:  
+                        description, amount_str = match
+                        amount = float(amount_str.replace(',', ''))
+                        financial_details["line_items"].append({
+                            "description": description.strip(),
+                            "quantity": None,
+                            "unit_price": None,
+                            "total": amount
+                        })
+                    elif len(match) == 4:  
+                        description, qty_str, price_str, total_str = match
+                        quantity = float(qty_str.replace(',', ''))
+                        unit_price = float(price_str.replace(',', ''))
+                        total = float(total_str.replace(',', ''))
+                        financial_details["line_items"].append({
+                            "description": description.strip(),
+                            "quantity": quantity,
+                            "unit_price": unit_price,
+                            "total": total
+                        })
+                except (ValueError, IndexError):
+                    continue
+        except Exception as e:
+            logger.warning("Error extracting line items: %s", e)
+            continue
+
+
+    for pattern in _TAX_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            financial_details["tax_info"] = text[match.start():match.end()]
+            break
+
+    return financial_details
+
+def extract_payment_structure(text: str) -> Dict:
+    """Extract payment terms and structure with improved accuracy"""
+    text_lower = text.lower()
+    payment_structure = {
+        "payment_terms": None,
+        "payment_schedules": [],
+        "due_dates": [],
+        "payment_methods": [],
+        "banking_details": None
+    }
+
+    # Locate the payment-related regions once; every pattern below only
+    # scans those windows instead of the whole document. The scans run on
+    # a one-byte-per-character copy so match offsets still index the text.
+    data = text_lower.encode('ascii', 'replace')
+    windows = _payment_windows(data)
+
+    for pattern in _PAYMENT_TERMS_PATTERNS:
+        match = next(_finditer_windows(pattern, data, windows), None)
+        if match:
+            term = text[match.start(1):match.end(1)].strip()
+
+            term = _WS_RE.sub(' ', term)
+            if 'Net' not in term and 'day' in term.lower():
+                term = f"Net {term}"
+            payment_structure["payment_terms"] = term
+            break
+
+
+    found_methods = set()  
+
+    for match in _finditer_windows(_PAYMENT_METHOD_RE, data, windows):
+        _, group = _fused_group(match)
+
+
+        method = text_lower[match.start(group):match.end(group)].strip()
+
+
+        methods_list = _METHOD_SPLIT_RE.split(method)
+        for m in methods_list:
+            m = m.strip()
+            if len(m) > 2 and m not in ['or', 'and', 'via', 'by', 'through']:
+                found_methods.add(_canonical_method(m))
+
+    payment_structure["payment_methods"] = list(found_methods)
+
+    # Extract payment schedules and due dates, listed by pattern and then
+    # by position as when each pattern scanned the text on its own
+    schedule_hits = []
+    for match in _PAYMENT_SCHEDULE_RE.finditer(data):
+        index, group = _fused_group(match)
+        schedule_hits.append((index, match.start(group), text_lower[match.start(group):match.end(group)]))
+    for _, _, schedule in sorted(schedule_hits):
+        schedule = schedule.strip().capitalize()
+        if schedule not in payment_structure["payment_schedules"]:
+            payment_structure["payment_schedules"].append(schedule)
+
+    date_hits = []
+    for match in _DUE_DATE_RE.finditer(data):
+        index, group = _fused_group(match)
+        date_hits.append((index, match.start(group), text[match.start(group):match.end(group)]))
+    for _, _, date in sorted(date_hits):
+        date = date.strip()
+        if date not in payment_structure["due_dates"]:
+            payment_structure["due_dates"].append(date)
+
+    # Extract banking details - earlier alternatives take priority over earlier position
+    banking_hits = {}
+    for match in _finditer_windows(_BANKING_RE, data, windows):
+        index, group = _fused_group(match)
+        if index not in banking_hits:
+            banking_hits[index] = text[match.start(group):match.end(group)]
+    if banking_hits:
+        payment_structure["banking_details"] = banking_hits[min(banking_hits)].strip()
+
+    return payment_structure
+
+def extract_revenue_classification(text: str) -> Dict:
+    """Extract revenue classification information"""
+    text_lower = text.lower()
+    revenue_classification = {
+        "recurring_payments": False,
+        "one_time_payments": False,
+        "subscription_model": None,
+        "billing_cycle": None,
+        "renewal_terms": None,
+        "auto_renewal": False
+    }
+
+
+    for pattern in _RECURRING_PATTERNS:
+        if pattern.search(text_lower):
+            revenue_classification["recurring_payments"] = True
+            break
+
+
+    for pattern in _ONE_TIME_PATTERNS:
+        if pattern.search(text_lower):
+            revenue_classification["one_time_payments"] = True
+            break
+
+
+    cycle_match = _BILLING_CYCLE_RE.search(text_lower)
+    if cycle_match:
+        revenue_classification["billing_cycle"] = text[cycle_match.start(1):cycle_match.end(1)]
+
+    return revenue_classification
+
+def extract_sla(text: str) -> Dict:
+    """Extract Service Level Agreement information"""
+    text_lower = text.lower()
+    sla = {
+        "performance_metrics": [],
+        "benchmarks": [],
+        "penalty_clauses": [],
+        "remedies": [],
+        "support_terms": None,
+        "maintenance_terms": None
+    }
+
+    # Extract performance metrics
+    for pattern in _SLA_METRIC_PATTERNS:
+        for match in pattern.finditer(text_lower):
+            metric = text[match.start(1):match.end(1)].strip()
+            if metric and metric not in sla["performance_metrics"]:
+                sla["performance_metrics"].append(metric)
+
+    return sla
+
+def extract_account_info(text: str) -> Dict:
+    """Extract account information"""
+    text_lower = text.lower()
+    account_info = {
+        "billing_details": None,
+        "account_numbers": [],
+        "contact_info": {}
+    }
+
+    # Extract account numbers
+    for pattern in _ACCOUNT_PATTERNS:
+        account_info["account_numbers"].extend(
+            text[match.start(1):match.end(1)] for match in pattern.finditer(text_lower)
+        )
+
+    # Extract contact information
+    emails = _EMAIL_RE.findall(text)
+
+    phones = []
+    for pattern in _PHONE_PATTERNS:
+        matches = pattern.findall(text)
+        for match in matches:
+            if isinstance(match, tuple):
+
+                phone = f"({match[0]}) {match[1]}-{match[2]}"
+            else:
+                phone = match
+            phones.append(phone)
+
+    if emails:
+        account_info["contact_info"]["emails"] = emails
+    if phones:
+        account_info["contact_info"]["phones"] = phones
+
+    return account_info
+
 class ContractProcessor:
     def __init__(self):
         self.huggingface_api_url = "https://api-inference.huggingface.co/models/"
         self.huggingface_headers = {}
         if settings.huggingface_api_key:
             self.huggingface_headers = {"Authorization": f"Bearer {settings.huggingface_api_key}"}
+        # Shared async client so AI calls never block the event loop and
+        # reuse pooled HTTP/2 connections instead of a handshake per call
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=15,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        # Bounds in-flight Hugging Face requests across all contracts
+        self._ai_semaphore = asyncio.Semaphore(settings.huggingface_max_concurrency)
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        await self._http.aclose()
+    
+    async def _query_model(self, model: str, payload: Dict[str, Any], timeout: float) -> Optional[Any]:
+        """
+        POST a payload to a Hugging Face model and return the decoded JSON, or
+        None on a non-200 response. Results are cached in Redis by model and
+        payload so re-uploads of the same contract skip the round trip.
+        """
+        ttl = settings.huggingface_cache_ttl
+        key = None
+        if ttl:
+            digest = hashlib.blake2b(json.dumps(payload, sort_keys=True).encode(), digest_size=16).hexdigest()
+            key = f"hf:{model}:{digest}"
+            cached = await get_cached_result(key)
+            if cached is not None:
+                return cached
+        
+        async with self._ai_semaphore:
+            response = await self._http.post(
+                f"{self.huggingface_api_url}{model}",
+                headers=self.huggingface_headers,
+                json=payload,
+                timeout=timeout
+            )
+        
+        if response.status_code != 200:
+            return None
+        result = response.json()
+        if key:
+            await set_cached_result(key, result, ttl)
+        return result
     
     async def process_contract(self, contract_id: str, file_path: str):
         """Process contract and extract data"""
         db = await get_database()
         
         try:
-            print(f"Starting processing for contract {contract_id}")
+            started = time.perf_counter()
+            logger.info("Processing contract %s", contract_id)
             
             # Update status to processing
             await db.contracts.update_one(
@@ -28,62 +802,72 @@ class ContractProcessor:
                 {"$set": {"status": "processing", "progress": 10}}
             )
             
+            # Reuse the results of an identical, already processed upload
+            content_hash = await asyncio.to_thread(_file_digest, file_path)
+            duplicate = await db.contracts.find_one(
+                {"content_hash": content_hash, "status": "completed"},
+                {"_id": 0, "contract_id": 1, "extracted_data": 1, "score": 1, "gaps": 1}
+            )
+            if duplicate:
+                logger.info("Contract %s is a duplicate of %s, reusing its results", contract_id, duplicate["contract_id"])
+                await db.contracts.update_one(
+                    {"contract_id": contract_id},
+                    {
+                        "$set": {
+                            "status": "completed",
+                            "progress": 100,
+                            "extracted_data": duplicate.get("extracted_data"),
+                            "score": duplicate.get("score"),
+                            "gaps": duplicate.get("gaps", []),
+                            "content_hash": content_hash,
+                            "processed_at": datetime.utcnow()
+                        }
+                    }
+                )
+                return
+            
             # Extract text from PDF
-            print(f"Extracting text from PDF: {file_path}")
-            text = await self.extract_text_from_pdf(file_path)
-            print(f"Extracted {len(text)} characters from PDF")
+            logger.debug("Extracting text from PDF: %s", file_path)
+            text = await asyncio.to_thread(self.extract_text_from_pdf, file_path)
+            logger.debug("Extracted %d characters from PDF", len(text))
             
-            await db.contracts.update_one(
-                {"contract_id": contract_id},
-                {"$set": {"progress": 30}}
-            )
+            await set_contract_progress(contract_id, 30)
             
             # Extract structured data
-            print(f"Extracting structured data...")
+            logger.debug("Extracting structured data...")
             extracted_data = await self.extract_contract_data(text)
-            print(f"Extracted data - Parties: {len(extracted_data.parties)}, Financial: {extracted_data.financial_details is not None}")
-            
-            await db.contracts.update_one(
-                {"contract_id": contract_id},
-                {"$set": {"progress": 70}}
-            )
+            logger.debug("Extracted data - Parties: %d, Financial: %s", len(extracted_data["parties"]), extracted_data["financial_details"] is not None)
             
-            # Calculate score and identify gaps
-            print(f"Calculating score and gaps...")
-            score, gaps = await self.calculate_score_and_gaps(extracted_data)
-            print(f"Calculated score: {score}, Gaps: {len(gaps)}")
+            await set_contract_progress(contract_id, 70)
             
-            await db.contracts.update_one(
-                {"contract_id": contract_id},
-                {"$set": {"progress": 90}}
-            )
+            # Calculate confidence, score and gaps
+            logger.debug("Calculating score and gaps...")
+            extracted_data["confidence_scores"], score, gaps = score_and_confidence(extracted_data)
+            logger.debug("Calculated score: %s, Gaps: %d", score, len(gaps))
             
-            # Convert to dict for storage
-            extracted_data_dict = extracted_data.dict() if hasattr(extracted_data, 'dict') else {}
-            gaps_dict = [gap.dict() if hasattr(gap, 'dict') else gap for gap in gaps]
+            await set_contract_progress(contract_id, 90)
             
             # Update final results
-            print(f"Saving final results...")
+            logger.debug("Saving final results...")
             await db.contracts.update_one(
                 {"contract_id": contract_id},
                 {
                     "$set": {
                         "status": "completed",
                         "progress": 100,
-                        "extracted_data": extracted_data_dict,
+                        "extracted_data": extracted_data,
                         "score": score,
-                        "gaps": gaps_dict,
+                        "gaps": gaps,
+                        "content_hash": content_hash,
                         "processed_at": datetime.utcnow()
                     }
                 }
             )
             
-            print(f"Successfully processed contract {contract_id}")
+            logger.info("Processed contract %s in %.2fs", contract_id, time.perf_counter() - started)
             
         except Exception as e:
-            print(f"Error processing contract {contract_id}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error processing contract %s: %s", contract_id, e)
             
             # Update error status
             await db.contracts.update_one(
@@ -97,139 +881,135 @@ class ContractProcessor:
                 }
             )
     
-    async def extract_text_from_pdf(self, file_path: str) -> str:
+    def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text content from PDF file with robust error handling"""
-        text = ""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Check if PDF is readable
-                if len(pdf_reader.pages) == 0:
-                    raise ValueError("PDF has no pages")
-                
-                # Extract text from all pages
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
+            try:
+                doc = fitz.open(file_path)
+            except Exception as e:
+                logger.warning("PyMuPDF could not open %s, falling back to PyPDF2: %s", file_path, e)
+                text = self._extract_text_alternative(file_path)
+            else:
+                try:
+                    # Check if PDF is readable
+                    if doc.page_count == 0:
+                        raise ValueError("PDF has no pages")
+                    
+                    # Stream pages until the page cap is reached or, with early
+                    # stopping enabled, every required section has been seen
+                    parts = []
+                    found = 0
+                    last_page = None
+                    max_pages = settings.pdf_max_pages
+                    early_stop = settings.pdf_early_stop
+                    for page_num, page in enumerate(doc):
+                        if last_page is not None and page_num > last_page:
+                            logger.debug("All sections found by page %d of %d, skipping the rest", page_num, doc.page_count)
+                            break
+                        if max_pages and page_num >= max_pages:
+                            logger.info("Stopping at page cap of %d pages for %s", max_pages, file_path)
+                            break
+                        try:
+                            page_text = page.get_text("text", flags=_PDF_TEXT_FLAGS, clip=fitz.INFINITE_RECT())
+                        except Exception as e:
+                            logger.warning("Error extracting text from page %d: %s", page_num + 1, e)
+                            continue
                         if page_text and page_text.strip():
-                            text += page_text + "\n"
+                            parts.append(page_text)
+                            if early_stop and last_page is None:
+                                found |= _found_sections(page_text)
+                                if found == _ALL_SECTIONS:
+                                    # Read one more page so a section split across
+                                    # the page break is kept whole
+                                    last_page = page_num + 1
                         else:
-                            print(f"Warning: No text extracted from page {page_num + 1}")
-                    except Exception as e:
-                        print(f"Error extracting text from page {page_num + 1}: {e}")
-                        continue
-                
-                # If no text was extracted, try alternative method
-                if not text.strip():
-                    print("No text extracted with standard method, trying alternative extraction...")
-                    text = await self._extract_text_alternative(file_path)
-                
-                # Clean up the extracted text
-                text = self._clean_extracted_text(text)
-                
-                if not text.strip():
-                    raise ValueError("No readable text content found in PDF")
-                
-                return text
-                
+                            logger.debug("No text extracted from page %d", page_num + 1)
+                finally:
+                    doc.close()
+                text = "\n".join(parts)
+            
+            # Clean up the extracted text
+            text = _clean_extracted_text(text)
+            
+            if not text.strip():
+                raise ValueError("No readable text content found in PDF")
+            
+            return text
+            
         except Exception as e:
-            print(f"Error extracting text from PDF {file_path}: {e}")
+            logger.error("Error extracting text from PDF %s: %s", file_path, e)
             raise ValueError(f"Failed to extract text from PDF: {e}")
     
-    async def _extract_text_alternative(self, file_path: str) -> str:
-        """Alternative PDF text extraction method for problematic PDFs"""
+    def _extract_text_alternative(self, file_path: str) -> str:
+        """Fallback PyPDF2 extraction for PDFs that PyMuPDF cannot open"""
         try:
-            import PyPDF2
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
+                parts = []
                 for page in pdf_reader.pages:
                     try:
-                        # Try different extraction methods
-                        if hasattr(page, 'extract_text'):
-                            page_text = page.extract_text()
-                        else:
-                            page_text = ""
-                        
+                        page_text = page.extract_text()
                         if page_text:
-                            text += page_text + "\n"
+                            parts.append(page_text)
                     except:
                         continue
-                return text
+                return "\n".join(parts)
         except Exception as e:
-            print(f"Alternative extraction failed: {e}")
-            return ""
-    
-    def _clean_extracted_text(self, text: str) -> str:
-        """Clean and normalize extracted text"""
-        if not text:
+            logger.warning("Alternative extraction failed: %s", e)
             return ""
-        
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove common PDF artifacts
-        text = re.sub(r'[^\x00-\x7F]+', ' ', text)  # Remove non-ASCII characters
-        
-        # Normalize line breaks
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Remove excessive newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        return text.strip()
     
-    async def extract_contract_data(self, text: str) -> ExtractedData:
+    async def extract_contract_data(self, text: str) -> Dict[str, Any]:
         """Extract structured data from contract text"""
         try:
             # Use regex patterns and AI for extraction
-            extracted_data = ExtractedData()
-            
-            # Extract parties - convert to proper model format
-            parties_data = self.extract_parties(text)
-            if parties_data:
-                from .models import PartyInfo
-                extracted_data.parties = [PartyInfo(**party) for party in parties_data]
-            
-            # Extract financial details - convert to proper model format
-            financial_data = self.extract_financial_details(text)
-            if financial_data:
-                from .models import FinancialDetails, LineItem
-                # Convert line items
-                line_items = []
-                for item_data in financial_data.get("line_items", []):
-                    if isinstance(item_data, dict):
-                        line_items.append(LineItem(**item_data))
-                financial_data["line_items"] = line_items
-                extracted_data.financial_details = FinancialDetails(**financial_data)
-            
-            # Extract payment structure - convert to proper model format
-            payment_data = self.extract_payment_structure(text)
-            if payment_data:
-                from .models import PaymentStructure
-                extracted_data.payment_structure = PaymentStructure(**payment_data)
+            extracted_data = _empty_extracted_data()
             
-            # Extract revenue classification - convert to proper model format
-            revenue_data = self.extract_revenue_classification(text)
-            if revenue_data:
-                from .models import RevenueClassification
-                extracted_data.revenue_classification = RevenueClassification(**revenue_data)
+            # Bound the regex phase on unusually large documents, cutting at
+            # a word boundary so no amount or name is split
+            scan_text = text
+            if len(text) > _MAX_SCAN:
+                cut = text.rfind(' ', 0, _MAX_SCAN)
+                if cut <= 0:
+                    cut = _MAX_SCAN
+                scan_text = text[:cut]
+                logger.warning("Contract text is %d characters, scanning the first %d", len(text), cut)
             
-            # Extract SLA information - convert to proper model format
-            sla_data = self.extract_sla(text)
-            if sla_data:
-                from .models import ServiceLevelAgreement
-                extracted_data.sla = ServiceLevelAgreement(**sla_data)
+            # The section extractors are independent, CPU-bound regex scans, so
+            # run them side by side in worker processes instead of one after
+            # another on the event loop thread
+            extractors = (
+                extract_parties,
+                extract_financial_details,
+                extract_payment_structure,
+                extract_revenue_classification,
+                extract_sla,
+                extract_account_info,
+            )
+            (parties_data, financial_data, payment_data,
+             revenue_data, sla_data, account_data) = await _run_extractors(
+                [(extractor, scan_text) for extractor in extractors]
+            )
             
-            # Extract account information - convert to proper model format
-            account_data = self.extract_account_info(text)
-            if account_data:
-                from .models import AccountInfo
-                extracted_data.account_info = AccountInfo(**account_data)
+            # The contract value is critical for scoring; if it was not in
+            # the scanned part, look for financial details in the rest
+            if len(scan_text) < len(text) and not financial_data["total_value"]:
+                logger.info("No contract value in the first %d characters, scanning the remainder", len(scan_text))
+                remainder, = await _run_extractors(
+                    [(extract_financial_details, text[len(scan_text):])]
+                )
+                for key in ("total_value", "currency", "tax_info"):
+                    if not financial_data[key]:
+                        financial_data[key] = remainder[key]
+                financial_data["line_items"].extend(remainder["line_items"])
             
-            # Calculate confidence scores
-            extracted_data.confidence_scores = self.calculate_confidence_scores(extracted_data, text)
+            # Keep the plain dicts the extractors produce; they are written to
+            # MongoDB as-is and only validated at the API response boundary
+            extracted_data["parties"] = parties_data or []
+            extracted_data["financial_details"] = financial_data or None
+            extracted_data["payment_structure"] = payment_data or None
+            extracted_data["revenue_classification"] = revenue_data or None
+            extracted_data["sla"] = sla_data or None
+            extracted_data["account_info"] = account_data or None
             
             # Use AI for better extraction if Hugging Face key is available
             if settings.huggingface_api_key:
@@ -238,613 +1018,64 @@ class ContractProcessor:
             return extracted_data
         
         except Exception as e:
-            print(f"Error in extract_contract_data: {e}")
-            # Return minimal data structure to prevent complete failure
-            return ExtractedData()
-    
-    def extract_parties(self, text: str) -> List:
-        """Extract party information using comprehensive regex patterns"""
-        parties = []
-        found_names = set()  # Track found names to avoid duplicates
-        
-        # Enhanced company name patterns (more selective)
-        company_patterns = [
-            # PARTY A/B specific patterns
-            r'PARTY\s+[AB]:\s*([A-Za-z][a-zA-Z\s&.,\-\']*?(?:Inc\.|LLC|Corp\.|Corporation|Company|Ltd\.|Limited))',
-            
-            # Any line that ends with corporate suffix
-            r'\b([A-Za-z][a-zA-Z\s&.,\-\']{3,40}?(?:Inc\.|LLC|Corp\.|Corporation|Company|Ltd\.|Limited))\b',
-        ]
-        
-        # Extract parties using all patterns
-        for pattern in company_patterns:
-            try:
-                matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-                # Handle tuple results from multiple groups
-                if matches and isinstance(matches[0], tuple):
-                    # Flatten tuples from 'between X and Y' pattern
-                    flat_matches = []
-                    for match_tuple in matches:
-                        for match in match_tuple:
-                            if match.strip():
-                                flat_matches.append(match)
-                    matches = flat_matches
-                
-                for match in matches:
-                    name = match.strip()
-                    
-                    # Clean up the name
-                    name = re.sub(r',$', '', name)  # Remove trailing comma only
-                    name = re.sub(r'\s+', ' ', name)   # Normalize whitespace
-                    
-                    # Validate the name - more strict validation
-                    if (len(name) > 3 and 
-                        len(name) < 80 and 
-                        name not in found_names and
-                        not re.match(r'^\d+$', name) and  # Not just numbers
-                        not name.lower() in ['the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'legal entity', 'entity', 'delaware corporation', 'limited liability company'] and
-                        # Must contain actual company identifiers
-                        re.search(r'\b(?:Inc\.?|LLC|Corp\.?|Corporation|Company|Ltd\.?|Limited)\b', name, re.IGNORECASE) and
-                        # Must have a proper company name (not just entity type)
-                        not re.match(r'^(?:Delaware|California|New York|Nevada)\s+Corporation$', name, re.IGNORECASE) and
-                        not re.match(r'^Limited Liability Company$', name, re.IGNORECASE)):
-                        
-                        found_names.add(name)
-                        
-                        # Determine entity type
-                        entity_type = None
-                        if re.search(r'\b(?:Inc\.?|Corporation|Corp\.?)\b', name, re.IGNORECASE):
-                            entity_type = "Corporation"
-                        elif re.search(r'\bLLC\b', name, re.IGNORECASE):
-                            entity_type = "Limited Liability Company"
-                        elif re.search(r'\b(?:Ltd\.?|Limited)\b', name, re.IGNORECASE):
-                            entity_type = "Limited Company"
-                        
-                        parties.append({
-                            "name": name,
-                            "legal_entity": entity_type,
-                            "registration_details": None,
-                            "signatories": [],
-                            "roles": []
-                        })
-            except Exception as e:
-                print(f"Error in pattern {pattern}: {e}")
-                continue
-        
-        # Look for signatories if we have parties
-        if parties:
-            signatory_patterns = [
-                r'(?:Signed|Signature|By):\s*([A-Z][a-zA-Z\s\.]{3,30})',
-                r'([A-Z][a-zA-Z\s\.]{3,30}),?\s+(?:CEO|CFO|President|Vice President|Director|Manager)',
-                r'(?:CEO|CFO|President|Vice President|Director|Manager):\s*([A-Z][a-zA-Z\s\.]{3,30})'
-            ]
-            
-            for pattern in signatory_patterns:
-                try:
-                    matches = re.findall(pattern, text, re.IGNORECASE)
-                    for match in matches:
-                        signatory = match.strip()
-                        if len(signatory) > 3 and len(signatory) < 50:
-                            # Add to first party (can be improved with better matching)
-                            if parties and len(parties[0]["signatories"]) < 3:
-                                parties[0]["signatories"].append(signatory)
-                except Exception as e:
-                    continue
-        
-        # Remove duplicates while preserving order
-        unique_parties = []
-        seen_names = set()
-        for party in parties:
-            if party["name"] not in seen_names:
-                seen_names.add(party["name"])
-                unique_parties.append(party)
-        
-        return unique_parties[:10]  # Limit to 10 parties
+            logger.error("Error in extract_contract_data: %s", e)
+            # Let process_contract mark the contract failed; an empty result
+            # stored as completed would be reused for every later upload of
+            # the same file through its content hash
+            raise
     
-    def extract_financial_details(self, text: str) -> Dict:
-        """Extract comprehensive financial information"""
-        financial_details = {
-            "line_items": [],
-            "total_value": None,
-            "currency": None,
-            "tax_info": None,
-            "additional_fees": []
-        }
-        
-        
-        currency_patterns = [
-            (r'\$', 'USD'),
-            (r'USD|US\$|US Dollar', 'USD'),
-            (r'CAD|CA\$|Canadian Dollar', 'CAD'),
-            (r'EUR|€|Euro', 'EUR'),
-            (r'GBP|£|British Pound', 'GBP'),
-            (r'AUD|AU\$|Australian Dollar', 'AUD'),
-            (r'JPY|¥|Japanese Yen', 'JPY')
-        ]
-        
-        for pattern, currency_code in currency_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                financial_details["currency"] = currency_code
-                break
-        
-        
-        money_patterns = [
-            
-            r'(?:USD|CAD|EUR|GBP|AUD)\s*([\d,]+\.?\d*)',
-            r'\$\s*([\d,]+\.?\d*)',
-            r'€\s*([\d,]+\.?\d*)',
-            r'£\s*([\d,]+\.?\d*)',
-            
-            
-            r'(?:total|amount|sum|fee|cost|price|value|payment)\s*[:\s]*(?:USD|CAD|EUR|GBP|AUD)?\s*\$?\s*([\d,]+\.?\d*)',
-            r'(?:monthly|annual|yearly)\s*(?:fee|cost|payment)\s*[:\s]*\$?\s*([\d,]+\.?\d*)',
-            
-            
-            r'(?:contract|agreement)\s*(?:value|amount|total)\s*[:\s]*\$?\s*([\d,]+\.?\d*)',
-            
-            
-            r'\$\s*([\d,]+\.?\d*)\s*(?:USD|CAD|EUR|GBP)?',
-        ]
-        
-        amounts = []
-        amount_contexts = []
-        
-        for pattern in money_patterns:
-            try:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    amount_str = match.group(1)
-                    try:
-                        amount = float(amount_str.replace(',', ''))
-                        if 0 < amount < 1000000000:  
-                            amounts.append(amount)
-                            
-
-                            start = max(0, match.start() - 50)
-                            end = min(len(text), match.end() + 50)
-                            context = text[start:end].strip()
-                            amount_contexts.append((amount, context))
-                    except ValueError:
-                        continue
-            except Exception as e:
-                print(f"Error in money pattern {pattern}: {e}")
-                continue
-        
-        
-        if amounts:
-            
-            total_indicators = [
-                'total', 'sum', 'amount', 'contract value', 'total value', 
-                'grand total', 'final amount', 'total cost', 'total price'
-            ]
-            
-            total_value = None
-            
-            
-            for amount, context in amount_contexts:
-                context_lower = context.lower()
-                if any(indicator in context_lower for indicator in total_indicators):
-                    if not total_value or amount > total_value:
-                        total_value = amount
+    async def enhance_with_ai(self, extracted_data: Dict[str, Any], text: str) -> Dict[str, Any]:
+        try:
+            # The classification and text-generation requests are independent
+            enhanced_confidence, _ = await asyncio.gather(
+                self._classify_sections(text),
+                self._extract_with_text_generation(extracted_data, text),
+            )
             
             
-            if not total_value:
-                total_value = max(amounts)
+            # Blended into the rule-based confidence by score_and_confidence
+            extracted_data["confidence_scores"] = enhanced_confidence
             
-            financial_details["total_value"] = total_value
-        
-
-        line_item_patterns = [
-            r'(?:^|\n)\s*[-•*]\s*([^:]+?):\s*\$?\s*([\d,]+\.?\d*)',
-            r'(?:^|\n)\s*(\d+\.?\d*)\.\s*([^:]+?)\s*[-:]\s*\$?\s*([\d,]+\.?\d*)',
-            r'([A-Za-z][^:]{5,30})\s*[-:]\s*(?:Quantity|Qty):\s*(\d+)\s*[-:]\s*(?:Unit Price|Price):\s*\$?\s*([\d,]+\.?\d*)\s*[-:]\s*(?:Total):\s*\$?\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in line_item_patterns:
-            try:
-                matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    try:
-                        if len(match) == 2:  
-                            description, amount_str = match
-                            amount = float(amount_str.replace(',', ''))
-                            financial_details["line_items"].append({
-                                "description": description.strip(),
-                                "quantity": None,
-                                "unit_price": None,
-                                "total": amount
-                            })
-                        elif len(match) == 4:  
-                            description, qty_str, price_str, total_str = match
-                            quantity = float(qty_str.replace(',', ''))
-                            unit_price = float(price_str.replace(',', ''))
-                            total = float(total_str.replace(',', ''))
-                            financial_details["line_items"].append({
-                                "description": description.strip(),
-                                "quantity": quantity,
-                                "unit_price": unit_price,
-                                "total": total
-                            })
-                    except (ValueError, IndexError):
-                        continue
-            except Exception as e:
-                print(f"Error extracting line items: {e}")
-                continue
-        
-
-        tax_patterns = [
-            r'(?:tax|VAT|GST|HST)\s*[:\s]*(\d+\.?\d*)\s*%',
-            r'(?:tax|VAT|GST|HST)\s*[:\s]*\$?\s*([\d,]+\.?\d*)',
-            r'(?:plus|including|excluding)\s*(?:tax|VAT|GST|HST)'
-        ]
-        
-        for pattern in tax_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                financial_details["tax_info"] = match.group(0)
-                break
-        
-        return financial_details
-    
-    def extract_payment_structure(self, text: str) -> Dict:
-        """Extract payment terms and structure with improved accuracy"""
-        payment_structure = {
-            "payment_terms": None,
-            "payment_schedules": [],
-            "due_dates": [],
-            "payment_methods": [],
-            "banking_details": None
-        }
-        
-        
-        terms_patterns = [
-            r'(?:Payment Terms?|Terms?):\s*(Net\s+\d+(?:\s+days?)?)',
-            r'(Net\s+\d+(?:\s+days?)?)',
-            r'payment[\s\w]*due[\s\w]*(\d+\s+days?)',
-            r'(\d+\s+days?\s*from\s*invoice)',
-            r'due\s*(?:in|within)?\s*(\d+\s*days?)',
-            r'payment\s*within\s*(\d+\s*days?)',
-        ]
-        
-        for pattern in terms_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                term = match.group(1).strip()
-                
-                term = re.sub(r'\s+', ' ', term)
-                if 'Net' not in term and 'day' in term.lower():
-                    term = f"Net {term}"
-                payment_structure["payment_terms"] = term
-                break
-        
-        
-        method_patterns = [
-            r'(?:Payment Methods?|Methods?|Pay by):\s*([^.]+)',
-            r'(?:via|through|by)\s*(credit card|wire transfer|ACH|check|bank transfer|electronic payment|direct deposit|paypal)',
-            r'(credit card|wire transfer|ACH|check|bank transfer|electronic payment|direct deposit|paypal)',
-        ]
-        
-        found_methods = set()  
-        
-        for pattern in method_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    method = match[0] if match[0] else match[-1]
-                else:
-                    method = match
-                
-                
-                method = method.strip().lower()
-                
-                
-                methods_list = re.split(r'[,;/&]|\sand\s|\sor\s', method)
-                for m in methods_list:
-                    m = m.strip()
-                    if len(m) > 2 and m not in ['or', 'and', 'via', 'by', 'through']:
-                        
-                        if 'credit' in m and 'card' in m:
-                            found_methods.add("Credit Card")
-                        elif 'wire' in m and 'transfer' in m:
-                            found_methods.add("Wire Transfer")
-                        elif 'ach' in m:
-                            found_methods.add("ACH")
-                        elif 'check' in m:
-                            found_methods.add("Check")
-                        elif 'bank' in m and 'transfer' in m:
-                            found_methods.add("Bank Transfer")
-                        elif 'electronic' in m and 'payment' in m:
-                            found_methods.add("Electronic Payment")
-                        elif 'direct' in m and 'deposit' in m:
-                            found_methods.add("Direct Deposit")
-                        elif 'paypal' in m:
-                            found_methods.add("PayPal")
-                        else:
-                            # Capitalize first letter of each word
-                            found_methods.add(m.title())
-        
-        payment_structure["payment_methods"] = list(found_methods)
-        
-        # Extract payment schedules
-        schedule_patterns = [
-            r'(monthly|quarterly|annually|yearly|weekly|bi-weekly)\s*(?:payment|billing|invoicing)',
-            r'(?:payment|billing|invoicing)\s*(monthly|quarterly|annually|yearly|weekly|bi-weekly)',
-            r'(monthly|quarterly|annually|yearly|weekly|bi-weekly)\s*basis',
-        ]
-        
-        for pattern in schedule_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                schedule = match.strip().capitalize()
-                if schedule not in payment_structure["payment_schedules"]:
-                    payment_structure["payment_schedules"].append(schedule)
-        
-        # Extract due dates
-        date_patterns = [
-            r'due\s*(?:on|by)?\s*(\d{1,2}(?:st|nd|rd|th)?\s*of\s*each\s*month)',
-            r'payment\s*due\s*(\w+\s*\d{1,2},?\s*\d{4})',
-            r'(\d{1,2}/\d{1,2}/\d{4})',
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                date = match.strip()
-                if date not in payment_structure["due_dates"]:
-                    payment_structure["due_dates"].append(date)
-        
-        # Extract banking details
-        banking_patterns = [
-            r'(?:Account|Acct)\s*(?:Number|#):\s*([A-Z0-9\-]+)',
-            r'(?:Routing|ABA)\s*(?:Number|#):\s*([0-9\-]+)',
-            r'Banking Details?:\s*([^.]+)',
-        ]
-        
-        for pattern in banking_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                payment_structure["banking_details"] = match.group(1).strip()
-                break
-        
-        return payment_structure
-    
-    def extract_revenue_classification(self, text: str) -> Dict:
-        """Extract revenue classification information"""
-        revenue_classification = {
-            "recurring_payments": False,
-            "one_time_payments": False,
-            "subscription_model": None,
-            "billing_cycle": None,
-            "renewal_terms": None,
-            "auto_renewal": False
-        }
-        
-        
-        recurring_patterns = [
-            r'recurring|subscription|monthly|quarterly|annually|yearly',
-            r'auto.?renew|automatic.?renewal'
-        ]
-        
-        for pattern in recurring_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                revenue_classification["recurring_payments"] = True
-                break
-        
-        
-        onetime_patterns = [r'one.?time|single payment|lump sum']
-        for pattern in onetime_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                revenue_classification["one_time_payments"] = True
-                break
-        
+        except Exception:
+            logger.exception("AI enhancement failed")
         
-        cycle_patterns = [r'(monthly|quarterly|annually|yearly|weekly)']
-        cycle_match = re.search('|'.join(cycle_patterns), text, re.IGNORECASE)
-        if cycle_match:
-            revenue_classification["billing_cycle"] = cycle_match.group(1)
-        
-        return revenue_classification
+        return extracted_data
     
-    def extract_sla(self, text: str) -> Dict:
-        """Extract Service Level Agreement information"""
-        sla = {
-            "performance_metrics": [],
-            "benchmarks": [],
-            "penalty_clauses": [],
-            "remedies": [],
-            "support_terms": None,
-            "maintenance_terms": None
-        }
-        
-        # Extract performance metrics
-        metric_patterns = [
-            r'(\d+\.?\d*%\s*(?:uptime|availability|performance))',
-            r'((?:uptime|availability):\s*\d+\.?\d*%)',
-            r'(response time[:\s]+(?:maximum\s+)?\d+\s+(?:seconds?|minutes?|hours?))',
-            r'(support response[:\s]+\d+\s+(?:hours?|minutes?))',
-            r'(\d+\s+(?:seconds?|minutes?|hours?)\s+(?:response|support))',
+    async def _classify_sections(self, text: str) -> Dict[str, float]:
+        """Score every section query against the text in one zero-shot request"""
+        queries = [
+            "This text contains company names and parties",
+            "This text contains financial amounts and currency",
+            "This text contains payment terms and methods",
+            "This text contains service level agreements",
+            "This text contains contact information"
         ]
         
-        for pattern in metric_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                metric = match.strip()
-                if metric and metric not in sla["performance_metrics"]:
-                    sla["performance_metrics"].append(metric)
-        
-        return sla
-    
-    def extract_account_info(self, text: str) -> Dict:
-        """Extract account information"""
-        account_info = {
-            "billing_details": None,
-            "account_numbers": [],
-            "contact_info": {}
+        # multi_label scores each query independently, as separate
+        # single-label requests did, in one round trip and forward pass
+        payload = {
+            "inputs": text[:1000],
+            "parameters": {
+                "candidate_labels": queries,
+                "multi_label": True
+            }
         }
         
-        # Extract account numbers
-        account_patterns = [
-            r'account[\s#]*:?\s*([A-Z0-9\-]+)',
-            r'customer[\s#]*:?\s*([A-Z0-9\-]+)',
-        ]
-        
-        for pattern in account_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            account_info["account_numbers"].extend(matches)
-        
-        # Extract contact information
-        email_pattern = r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-        phone_patterns = [
-            r'\((\d{3})\)\s*(\d{3})-?(\d{4})',  
-            r'(\d{3})[-.](\d{3})[-.](\d{4})',   
-            r'(\d{3})\s+(\d{3})\s+(\d{4})',    
-        ]
-        
-        emails = re.findall(email_pattern, text)
-        
-        phones = []
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                if isinstance(match, tuple):
-                    
-                    phone = f"({match[0]}) {match[1]}-{match[2]}"
-                else:
-                    phone = match
-                phones.append(phone)
-        
-        if emails:
-            account_info["contact_info"]["emails"] = emails
-        if phones:
-            account_info["contact_info"]["phones"] = phones
-        
-        return account_info
-    
-    def calculate_confidence_scores(self, extracted_data: ExtractedData, text: str) -> Dict[str, float]:
-        """Calculate confidence scores for extracted data"""
-        scores = {}
-        
-        
-        financial_score = 0.0
-        if extracted_data.financial_details:
-            if hasattr(extracted_data.financial_details, 'total_value') and extracted_data.financial_details.total_value:
-                financial_score += 0.4
-            if hasattr(extracted_data.financial_details, 'currency') and extracted_data.financial_details.currency:
-                financial_score += 0.3
-            if hasattr(extracted_data.financial_details, 'line_items') and extracted_data.financial_details.line_items:
-                financial_score += 0.3
-        scores["financial"] = financial_score
-        
-        
-        party_score = 0.0
-        if extracted_data.parties:
-            party_score = 0.5
-            if len(extracted_data.parties) >= 2:
-                party_score = 0.8
-            
-            for party in extracted_data.parties:
-                if hasattr(party, 'signatories') and party.signatories:
-                    party_score = min(1.0, party_score + 0.1)
-                if hasattr(party, 'legal_entity') and party.legal_entity:
-                    party_score = min(1.0, party_score + 0.1)
-        scores["parties"] = party_score
-        
-        
-        payment_score = 0.0
-        if extracted_data.payment_structure:
-            if hasattr(extracted_data.payment_structure, 'payment_terms') and extracted_data.payment_structure.payment_terms:
-                payment_score += 0.6
-            if hasattr(extracted_data.payment_structure, 'payment_methods') and extracted_data.payment_structure.payment_methods:
-                payment_score += 0.4
-        scores["payment"] = payment_score
-        
-        
-        sla_score = 0.0
-        if extracted_data.sla:
-            if hasattr(extracted_data.sla, 'performance_metrics') and extracted_data.sla.performance_metrics:
-                sla_score += 0.5
-            if hasattr(extracted_data.sla, 'support_terms') and extracted_data.sla.support_terms:
-                sla_score += 0.5
-        scores["sla"] = sla_score
-        
-        
-        contact_score = 0.0
-        if extracted_data.account_info:
-            if hasattr(extracted_data.account_info, 'contact_info') and extracted_data.account_info.contact_info:
-                contact_info = extracted_data.account_info.contact_info
-                if isinstance(contact_info, dict):
-                    if contact_info.get("emails"):
-                        contact_score += 0.5
-                    if contact_info.get("phones"):
-                        contact_score += 0.5
-        scores["contact"] = contact_score
-        
-        return scores
-    
-    async def enhance_with_ai(self, extracted_data: ExtractedData, text: str) -> ExtractedData:
         try:
-            
-            model_url = f"{self.huggingface_api_url}facebook/bart-large-mnli"
-            
-            
-            queries = [
-                "This text contains company names and parties",
-                "This text contains financial amounts and currency",
-                "This text contains payment terms and methods",
-                "This text contains service level agreements",
-                "This text contains contact information"
-            ]
-            
-            enhanced_confidence = {}
-            
-            for query in queries:
-                payload = {
-                    "inputs": {
-                        "text": text[:1000],  
-                        "candidate_labels": [query]
-                    }
+            result = await self._query_model("facebook/bart-large-mnli", payload, timeout=10)
+            if result:
+                return {
+                    label.split()[-1].lower(): score
+                    for label, score in zip(result.get('labels', []), result.get('scores', []))
                 }
-                
-                try:
-                    response = requests.post(
-                        model_url,
-                        headers=self.huggingface_headers,
-                        json=payload,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        if 'scores' in result and len(result['scores']) > 0:
-                            confidence = result['scores'][0]
-                            query_key = query.split()[-1].lower()  
-                            enhanced_confidence[query_key] = confidence
-                
-                except Exception as e:
-                    continue
-            
-            
-            if enhanced_confidence:
-                for key, value in enhanced_confidence.items():
-                    if key in extracted_data.confidence_scores:
-                        
-                        extracted_data.confidence_scores[key] = (
-                            extracted_data.confidence_scores[key] + value
-                        ) / 2
-            
-
-            await self._extract_with_text_generation(extracted_data, text)
-            
-        except Exception as e:
-            print(f"AI enhancement failed: {e}")
+        except Exception:
+            logger.exception("Zero-shot classification failed")
         
-        return extracted_data
+        return {}
     
-    async def _extract_with_text_generation(self, extracted_data: ExtractedData, text: str):
+    async def _extract_with_text_generation(self, extracted_data: Dict[str, Any], text: str):
         """Use text generation model to extract structured data"""
         try:
-            model_url = f"{self.huggingface_api_url}microsoft/DialoGPT-medium"
-            
             prompt = f"""
             Analyze this contract and extract:
             - Company names
@@ -864,194 +1095,147 @@ class ContractProcessor:
                 }
             }
             
-            response = requests.post(
-                model_url,
-                headers=self.huggingface_headers,
-                json=payload,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    generated_text = result[0].get('generated_text', '')
-                    self._parse_ai_response(extracted_data, generated_text)
+            result = await self._query_model("microsoft/DialoGPT-medium", payload, timeout=15)
+            if isinstance(result, list) and len(result) > 0:
+                generated_text = result[0].get('generated_text', '')
+                self._parse_ai_response(extracted_data, generated_text)
         
-        except Exception as e:
-            print(f"Text generation failed: {e}")
+        except Exception:
+            logger.exception("Text generation failed")
     
-    def _parse_ai_response(self, extracted_data: ExtractedData, ai_text: str):
+    def _parse_ai_response(self, extracted_data: Dict[str, Any], ai_text: str):
         """Parse AI-generated text and enhance extracted data"""
         try:
-            company_pattern = r'(?:Company|Corp|Inc|LLC|Ltd)[\w\s]+'
-            ai_companies = re.findall(company_pattern, ai_text, re.IGNORECASE)
+            ai_companies = _AI_COMPANY_RE.findall(ai_text)
             
-            existing_parties = [party.name for party in extracted_data.parties]
+            existing_parties = {party["name"] for party in extracted_data["parties"]}
             for company in ai_companies:
                 company = company.strip()
                 if company and len(company) > 3 and company not in existing_parties:
-                    from .models import PartyInfo
-                    extracted_data.parties.append(PartyInfo(
-                        name=company,
-                        legal_entity=None,
-                        registration_details=None,
-                        signatories=[],
-                        roles=[]
-                    ))
+                    existing_parties.add(company)
+                    extracted_data["parties"].append({
+                        "name": company,
+                        "legal_entity": None,
+                        "registration_details": None,
+                        "signatories": [],
+                        "roles": []
+                    })
             
-            amount_pattern = r'\$[\d,]+\.?\d*'
-            ai_amounts = re.findall(amount_pattern, ai_text)
+            ai_amounts = _AI_AMOUNT_RE.findall(ai_text)
             
-            if ai_amounts and extracted_data.financial_details:
+            financial_details = extracted_data["financial_details"]
+            if ai_amounts and financial_details:
                 for amount_str in ai_amounts:
                     try:
                         amount = float(amount_str.replace('$', '').replace(',', ''))
-                        if not extracted_data.financial_details.total_value or amount > extracted_data.financial_details.total_value:
-                            extracted_data.financial_details.total_value = amount
+                        if not financial_details["total_value"] or amount > financial_details["total_value"]:
+                            financial_details["total_value"] = amount
                     except ValueError:
                         continue
         
-        except Exception as e:
-            print(f"AI response parsing failed: {e}")
+        except Exception:
+            logger.exception("AI response parsing failed")
+
+
+def _gap(field: str, description: str, criticality: str) -> Dict[str, str]:
+    """Gap entry in the form stored with a contract"""
+    return {"field": field, "description": description, "criticality": criticality}
+
+# Per-section scoring rules: (key, confidence weight, score points, gap field,
+# gap description, gap criticality). A rule without a gap field only adds to
+# the score when the value is present.
+_SCORING_RULES = {
+    "financial": (
+        ("total_value", 0.4, 15, "total_value", "Missing total contract value", "high"),
+        ("currency", 0.3, 10, "currency", "Currency not specified", "medium"),
+        ("line_items", 0.3, 5, None, None, None),
+    ),
+    "payment": (
+        ("payment_terms", 0.6, 12, "payment_terms", "Missing payment terms (e.g., Net 30)", "high"),
+        ("payment_methods", 0.4, 8, "payment_methods", "Payment methods not specified", "medium"),
+    ),
+    "sla": (
+        ("performance_metrics", 0.5, 10, "performance_metrics", "Missing SLA performance metrics (uptime, response time)", "medium"),
+        ("support_terms", 0.5, 5, "support_terms", "Support terms not defined", "low"),
+    ),
+    "contact": (
+        ("emails", 0.5, 5, "contact_emails", "Missing contact email addresses", "low"),
+        ("phones", 0.5, 5, "contact_phones", "Missing contact phone numbers", "low"),
+    ),
+}
+
+# Gap recorded when a whole section is missing
+_MISSING_SECTION_GAPS = {
+    "financial": ("financial_details", "Missing financial information including total value and currency", "high"),
+    "payment": ("payment_structure", "Missing payment terms and methods", "high"),
+    "sla": ("sla", "No service level agreements found", "medium"),
+    "contact": ("contact_info", "Missing contact information", "low"),
+}
+
+def _score_section(name: str, section: Optional[Dict[str, Any]], gaps: List[Dict[str, str]]) -> Tuple[float, int]:
+    """Apply a section's scoring rules, appending its gaps; returns (confidence, score)"""
+    if not section:
+        gaps.append(_gap(*_MISSING_SECTION_GAPS[name]))
+        return 0.0, 0
     
-    async def calculate_score_and_gaps(self, extracted_data: ExtractedData) -> tuple[float, List[Gap]]:
-        """Calculate overall score and identify gaps"""
-        gaps = []
-        
-        financial_score = 0
-        party_score = 0
-        payment_score = 0
-        sla_score = 0
-        contact_score = 0
-        
-        if extracted_data.financial_details:
-            if hasattr(extracted_data.financial_details, 'total_value') and extracted_data.financial_details.total_value:
-                financial_score += 15
-            else:
-                gaps.append(Gap(
-                    field="total_value",
-                    description="Missing total contract value",
-                    criticality="high"
-                ))
-            
-            if hasattr(extracted_data.financial_details, 'currency') and extracted_data.financial_details.currency:
-                financial_score += 10
-            else:
-                gaps.append(Gap(
-                    field="currency",
-                    description="Currency not specified",
-                    criticality="medium"
-                ))
-            
-            if hasattr(extracted_data.financial_details, 'line_items') and extracted_data.financial_details.line_items:
-                financial_score += 5
-        else:
-            gaps.append(Gap(
-                field="financial_details",
-                description="Missing financial information including total value and currency",
-                criticality="high"
-            ))
-        
-        if extracted_data.parties and len(extracted_data.parties) >= 2:
-            party_score = 25
-        elif extracted_data.parties and len(extracted_data.parties) == 1:
-            party_score = 15
-            gaps.append(Gap(
-                field="parties",
-                description="Only one party identified, expected at least two parties",
-                criticality="medium"
-            ))
-        else:
-            gaps.append(Gap(
-                field="parties",
-                description="No contract parties identified",
-                criticality="high"
-            ))
-        
-        if extracted_data.payment_structure:
-            if hasattr(extracted_data.payment_structure, 'payment_terms') and extracted_data.payment_structure.payment_terms:
-                payment_score += 12
-            else:
-                gaps.append(Gap(
-                    field="payment_terms",
-                    description="Missing payment terms (e.g., Net 30)",
-                    criticality="high"
-                ))
-            
-            if hasattr(extracted_data.payment_structure, 'payment_methods') and extracted_data.payment_structure.payment_methods:
-                payment_score += 8
-            else:
-                gaps.append(Gap(
-                    field="payment_methods",
-                    description="Payment methods not specified",
-                    criticality="medium"
-                ))
-        else:
-            gaps.append(Gap(
-                field="payment_structure",
-                description="Missing payment terms and methods",
-                criticality="high"
-            ))
-        
-        if extracted_data.sla:
-            if hasattr(extracted_data.sla, 'performance_metrics') and extracted_data.sla.performance_metrics:
-                sla_score += 10
-            else:
-                gaps.append(Gap(
-                    field="performance_metrics",
-                    description="Missing SLA performance metrics (uptime, response time)",
-                    criticality="medium"
-                ))
-            
-            if hasattr(extracted_data.sla, 'support_terms') and extracted_data.sla.support_terms:
-                sla_score += 5
-            else:
-                gaps.append(Gap(
-                    field="support_terms",
-                    description="Support terms not defined",
-                    criticality="low"
-                ))
-        else:
-            gaps.append(Gap(
-                field="sla",
-                description="No service level agreements found",
-                criticality="medium"
-            ))
-        
-        if extracted_data.account_info and hasattr(extracted_data.account_info, 'contact_info') and extracted_data.account_info.contact_info:
-            contact_info = extracted_data.account_info.contact_info
-            if isinstance(contact_info, dict):
-                if contact_info.get("emails"):
-                    contact_score += 5
-                else:
-                    gaps.append(Gap(
-                        field="contact_emails",
-                        description="Missing contact email addresses",
-                        criticality="low"
-                    ))
-                
-                if contact_info.get("phones"):
-                    contact_score += 5
-                else:
-                    gaps.append(Gap(
-                        field="contact_phones",
-                        description="Missing contact phone numbers",
-                        criticality="low"
-                    ))
-            else:
-                gaps.append(Gap(
-                    field="contact_info",
-                    description="Contact information format error",
-                    criticality="low"
-                ))
+    confidence = 0.0
+    score = 0
+    for key, weight, points, gap_field, gap_description, criticality in _SCORING_RULES[name]:
+        if section.get(key):
+            confidence += weight
+            score += points
+        elif gap_field:
+            gaps.append(_gap(gap_field, gap_description, criticality))
+    return confidence, score
+
+def score_and_confidence(extracted_data: Dict[str, Any]) -> Tuple[Dict[str, float], float, List[Dict[str, str]]]:
+    """Calculate section confidence, overall score and gaps in one pass.
+
+    Any AI confidence already in extracted_data["confidence_scores"] is
+    averaged into the rule-based confidence of the matching section.
+    """
+    confidence = {}
+    gaps = []
+    
+    confidence["financial"], score = _score_section("financial", extracted_data["financial_details"], gaps)
+    
+    party_confidence = 0.0
+    parties = extracted_data["parties"]
+    if parties:
+        if len(parties) >= 2:
+            party_confidence = 0.8
+            score += 25
         else:
-            gaps.append(Gap(
-                field="contact_info",
-                description="Missing contact information",
-                criticality="low"
-            ))
+            party_confidence = 0.5
+            score += 15
+            gaps.append(_gap("parties", "Only one party identified, expected at least two parties", "medium"))
         
-        total_score = financial_score + party_score + payment_score + sla_score + contact_score
-        
-        return total_score, gaps
-
+        for party in parties:
+            if party["signatories"]:
+                party_confidence = min(1.0, party_confidence + 0.1)
+            if party["legal_entity"]:
+                party_confidence = min(1.0, party_confidence + 0.1)
+    else:
+        gaps.append(_gap("parties", "No contract parties identified", "high"))
+    confidence["parties"] = party_confidence
+    
+    confidence["payment"], points = _score_section("payment", extracted_data["payment_structure"], gaps)
+    score += points
+    
+    confidence["sla"], points = _score_section("sla", extracted_data["sla"], gaps)
+    score += points
+    
+    account_info = extracted_data["account_info"]
+    contact_info = account_info["contact_info"] if account_info else None
+    if contact_info and not isinstance(contact_info, dict):
+        gaps.append(_gap("contact_info", "Contact information format error", "low"))
+        confidence["contact"] = 0.0
+    else:
+        confidence["contact"], points = _score_section("contact", contact_info, gaps)
+        score += points
+    
+    for key, value in extracted_data["confidence_scores"].items():
+        if key in confidence:
+            confidence[key] = (confidence[key] + value) / 2
+    
+    return confidence, score, gaps
@@ -1,14 +1,17 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import DESCENDING, ASCENDING
+import redis.asyncio as aioredis
 from .config import settings
+import json
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
+    redis: Optional[aioredis.Redis] = None
 
 db = Database()
 
@@ -25,6 +28,9 @@ async def connect_to_mongodb() -> bool:
         # Create new connection
         db.client = AsyncIOMotorClient(
             settings.mongodb_url,
+            maxPoolSize=settings.mongodb_max_pool_size,
+            minPoolSize=settings.mongodb_min_pool_size,
+            waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
             serverSelectionTimeoutMS=5000  # 5 second timeout
         )
         
@@ -67,10 +73,15 @@ async def create_indexes():
         # Create a unique index on contract_id
         await contracts.create_index("contract_id", unique=True)
         
-        # Create indexes for frequently queried fields
-        await contracts.create_index([("status", ASCENDING)])
+        # Create indexes for frequently queried fields. The contract list
+        # filters on status and/or a minimum score and sorts by uploaded_at,
+        # so keys follow equality, sort, range order to walk the index in
+        # sort order instead of sorting in memory.
         await contracts.create_index([("uploaded_at", DESCENDING)])
-        await contracts.create_index([("score", DESCENDING)])
+        await contracts.create_index([("status", ASCENDING), ("uploaded_at", DESCENDING), ("score", DESCENDING)])
+        
+        # Look up already processed copies of an uploaded file
+        await contracts.create_index([("content_hash", ASCENDING)])
         
         logger.info("Database indexes created/updated successfully")
         
@@ -80,6 +91,71 @@ async def create_indexes():
 
 
 
+def get_redis() -> aioredis.Redis:
+    """
+    Get the shared Redis client used for short-lived processing state.
+    The connection is opened lazily on first command. Short timeouts keep
+    an unreachable Redis from stalling processing or status polls.
+    """
+    if db.redis is None:
+        db.redis = aioredis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=settings.redis_timeout,
+            socket_timeout=settings.redis_timeout
+        )
+    return db.redis
+
+def _progress_key(contract_id: str) -> str:
+    return f"contract:{contract_id}:progress"
+
+async def set_contract_progress(contract_id: str, progress: int):
+    """
+    Publish intermediate processing progress to Redis so that progress
+    pings do not cost a MongoDB write each. Failures are logged and ignored.
+    """
+    try:
+        await get_redis().set(_progress_key(contract_id), progress, ex=3600)
+    except Exception as e:
+        logger.warning(f"Failed to publish progress for contract {contract_id}: {e}")
+
+async def get_contract_progress(contract_id: str, default: int) -> int:
+    """
+    Get the latest progress published for a contract, or default when
+    Redis has none (or is unreachable).
+    """
+    try:
+        progress = await get_redis().get(_progress_key(contract_id))
+    except Exception as e:
+        logger.warning(f"Failed to read progress for contract {contract_id}: {e}")
+        return default
+    return int(progress) if progress is not None else default
+
+async def get_cached_result(key: str) -> Optional[Any]:
+    """
+    Get a JSON result cached in Redis, or None on a miss (or when Redis
+    is unreachable).
+    """
+    try:
+        cached = await get_redis().get(key)
+    except Exception as e:
+        logger.warning(f"Failed to read cached result {key}: {e}")
+        return None
+    return json.loads(cached) if cached is not None else None
+
+async def set_cached_result(key: str, value: Any, ttl: int):
+    """
+    Cache a JSON-serialisable result in Redis for ttl seconds.
+    Failures are logged and ignored.
+    """
+    try:
+        await get_redis().set(key, json.dumps(value), ex=ttl)
+    except Exception as e:
+        logger.warning(f"Failed to cache result {key}: {e}")
+
 async def close_database():
     if db.client:
         db.client.close()
+    if db.redis is not None:
+        await db.redis.aclose()
+        db.redis = None
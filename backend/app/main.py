@@ -1,17 +1,44 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from contextlib import asynccontextmanager
 from typing import Optional, List
+import aiofiles
+import aiofiles.os
+import asyncio
+import logging
 import os
 import uuid
 from datetime import datetime
+from pymongo.errors import BulkWriteError
 
-from .database import get_database
+from .database import get_database, get_contract_progress, close_database
 from .models import ContractResponse, ContractStatus, ContractListResponse
-from .contract_processor import ContractProcessor
+from .contract_processor import ContractProcessor, shutdown_extraction_pool
 from .config import settings
 
-app = FastAPI(title="Contract Intelligence API", version="1.0.0")
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Initialize contract processor
+processor = ContractProcessor()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the database and upload directory, and close clients on shutdown"""
+    await get_database()
+    os.makedirs(settings.upload_directory, exist_ok=True)
+    yield
+    await processor.aclose()
+    shutdown_extraction_pool()
+    await close_database()
+
+app = FastAPI(
+    title="Contract Intelligence API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # CORS middleware
 app.add_middleware(
@@ -22,41 +49,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize contract processor
-processor = ContractProcessor()
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connection on startup"""
-    await get_database()
 
-@app.post("/contracts/upload", response_model=dict)
-async def upload_contract(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
-):
-    """Upload and process a contract file"""
+def validate_upload(file: UploadFile):
+    """Reject uploads that are not PDFs or exceed the size limit"""
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     if file.size > 50 * 1024 * 1024:  # 50MB limit
         raise HTTPException(status_code=400, detail="File size exceeds 50MB limit")
-    
+
+async def remove_uploads(file_paths):
+    """Delete saved uploads that will not get a contract record"""
+    for file_path in file_paths:
+        try:
+            await aiofiles.os.remove(file_path)
+        except OSError:
+            pass
+
+async def save_upload(file: UploadFile) -> dict:
+    """Save an uploaded file to disk and return its new contract record"""
     # Generate unique contract ID
     contract_id = str(uuid.uuid4())
     
     # Save uploaded file
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, f"{contract_id}.pdf")
+    file_path = os.path.join(settings.upload_directory, f"{contract_id}.pdf")
     
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+    # Stream to disk in chunks so memory stays bounded per upload
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(1 << 16):
+                await buffer.write(chunk)
+    except Exception:
+        await remove_uploads([file_path])
+        raise
     
-    # Initialize contract record
-    db = await get_database()
-    await db.contracts.insert_one({
+    return {
         "contract_id": contract_id,
         "filename": file.filename,
         "file_path": file_path,
@@ -67,12 +94,79 @@ async def upload_contract(
         "extracted_data": None,
         "score": None,
         "gaps": []
-    })
+    }
+
+@app.post("/contracts/upload", response_model=dict)
+async def upload_contract(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...)
+):
+    """Upload and process a contract file"""
+    validate_upload(file)
+    contract = await save_upload(file)
+    
+    # Initialize contract record
+    db = await get_database()
+    await db.contracts.insert_one(contract)
     
     # Start background processing
-    background_tasks.add_task(processor.process_contract, contract_id, file_path)
+    background_tasks.add_task(processor.process_contract, contract["contract_id"], contract["file_path"])
     
-    return {"contract_id": contract_id, "message": "Contract uploaded successfully"}
+    return {"contract_id": contract["contract_id"], "message": "Contract uploaded successfully"}
+
+@app.post("/contracts/upload_bulk", response_model=dict)
+async def upload_contracts_bulk(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...)
+):
+    """Upload and process several contract files in one request"""
+    for file in files:
+        validate_upload(file)
+    
+    results = await asyncio.gather(*(save_upload(file) for file in files), return_exceptions=True)
+    contracts = [result for result in results if isinstance(result, dict)]
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        await remove_uploads(contract["file_path"] for contract in contracts)
+        raise errors[0]
+    
+    # Initialize all contract records in a single round trip
+    db = await get_database()
+    failed = set()
+    try:
+        await db.contracts.insert_many(contracts, ordered=False)
+    except BulkWriteError as e:
+        # Unordered inserts keep going past errors; only the reported
+        # documents are missing
+        failed = {error["index"] for error in e.details.get("writeErrors", [])}
+        logger.error("Failed to insert %d of %d contract records", len(failed), len(contracts))
+    except Exception:
+        # Unknown which records were written, so drop them all with the files
+        ids = [contract["contract_id"] for contract in contracts]
+        try:
+            await db.contracts.delete_many({"contract_id": {"$in": ids}})
+        except Exception:
+            logger.exception("Failed to remove contract records after a failed bulk insert")
+        await remove_uploads(contract["file_path"] for contract in contracts)
+        raise
+    
+    await remove_uploads(contracts[index]["file_path"] for index in sorted(failed))
+    inserted = [contract for index, contract in enumerate(contracts) if index not in failed]
+    if not inserted:
+        raise HTTPException(status_code=500, detail="Failed to save contract records")
+    
+    # Start background processing
+    for contract in inserted:
+        background_tasks.add_task(processor.process_contract, contract["contract_id"], contract["file_path"])
+    
+    return {
+        "contracts": [
+            {"contract_id": contract["contract_id"], "filename": contract["filename"]}
+            for contract in inserted
+        ],
+        "failed": [contracts[index]["filename"] for index in sorted(failed)],
+        "message": f"{len(inserted)} contracts uploaded successfully"
+    }
 
 @app.get("/contracts/{contract_id}/status", response_model=ContractStatus)
 async def get_contract_status(contract_id: str):
@@ -83,10 +177,15 @@ async def get_contract_status(contract_id: str):
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     
+    # Intermediate progress lives in Redis; MongoDB only records start and end
+    progress = contract["progress"]
+    if contract["status"] == "processing":
+        progress = await get_contract_progress(contract_id, progress)
+    
     return ContractStatus(
         contract_id=contract_id,
         status=contract["status"],
-        progress=contract["progress"],
+        progress=progress,
         error=contract.get("error")
     )
 
@@ -129,12 +228,25 @@ async def list_contracts(
     if min_score is not None:
         filter_query["score"] = {"$gte": min_score}
     
-    # Get total count
-    total = await db.contracts.count_documents(filter_query)
+    # Get total count; without a filter the collection metadata count is
+    # enough and avoids scanning every document
+    if filter_query:
+        total = await db.contracts.count_documents(filter_query)
+    else:
+        total = await db.contracts.estimated_document_count()
     
     # Get paginated results
     skip = (page - 1) * limit
-    cursor = db.contracts.find(filter_query).skip(skip).limit(limit).sort("uploaded_at", -1)
+    projection = {
+        "_id": 0,
+        "contract_id": 1,
+        "filename": 1,
+        "status": 1,
+        "score": 1,
+        "uploaded_at": 1,
+        "processed_at": 1
+    }
+    cursor = db.contracts.find(filter_query, projection).skip(skip).limit(limit).sort("uploaded_at", -1)
     contracts = await cursor.to_list(length=limit)
     
     # Format response
@@ -149,13 +261,15 @@ async def list_contracts(
             "processed_at": contract.get("processed_at")
         })
     
-    return ContractListResponse(
-        contracts=contract_list,
-        total=total,
-        page=page,
-        limit=limit,
-        pages=(total + limit - 1) // limit
-    )
+    # The rows come straight from our own projection, so skip re-validating
+    # them as ContractSummary models; response_model still documents the shape
+    return ORJSONResponse({
+        "contracts": contract_list,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "pages": (total + limit - 1) // limit
+    })
 
 @app.get("/contracts/{contract_id}/download")
 async def download_contract(contract_id: str):
@@ -167,7 +281,7 @@ async def download_contract(contract_id: str):
         raise HTTPException(status_code=404, detail="Contract not found")
     
     file_path = contract["file_path"]
-    if not os.path.exists(file_path):
+    if not await aiofiles.os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Contract file not found")
     
     return FileResponse(
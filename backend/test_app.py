@@ -1,9 +1,12 @@
 import sys
 import os
+from unittest.mock import AsyncMock, MagicMock
 from fastapi.testclient import TestClient
+from pymongo.errors import BulkWriteError
 
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app import main
 from app.main import app
 
 client = TestClient(app)
@@ -13,6 +16,68 @@ def test_health_check():
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
+def mock_bulk_upload(monkeypatch, tmp_path, insert_many=None):
+    contracts = MagicMock()
+    contracts.insert_many = AsyncMock(side_effect=insert_many)
+    contracts.delete_many = AsyncMock()
+
+    async def get_database():
+        return MagicMock(contracts=contracts)
+
+    process_contract = AsyncMock()
+    monkeypatch.setattr(main, "get_database", get_database)
+    monkeypatch.setattr(main.processor, "process_contract", process_contract)
+    monkeypatch.setattr(main.settings, "upload_directory", str(tmp_path))
+    return contracts, process_contract
+
+def post_two_pdfs(test_client=client):
+    return test_client.post("/contracts/upload_bulk", files=[
+        ("files", ("first.pdf", b"%PDF-1.4 first", "application/pdf")),
+        ("files", ("second.pdf", b"%PDF-1.4 second", "application/pdf")),
+    ])
+
+def test_bulk_upload_inserts_and_processes_every_file(monkeypatch, tmp_path):
+    contracts, process_contract = mock_bulk_upload(monkeypatch, tmp_path)
+
+    response = post_two_pdfs()
+    assert response.status_code == 200
+    returned = response.json()["contracts"]
+    assert [c["filename"] for c in returned] == ["first.pdf", "second.pdf"]
+
+    ids = [c["contract_id"] for c in returned]
+    inserted = contracts.insert_many.await_args.args[0]
+    assert [c["contract_id"] for c in inserted] == ids
+    assert [call.args[0] for call in process_contract.await_args_list] == ids
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{contract_id}.pdf" for contract_id in ids)
+
+def test_bulk_upload_processes_inserted_records_after_partial_failure(monkeypatch, tmp_path):
+    def insert_many(documents, ordered):
+        raise BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]})
+
+    contracts, process_contract = mock_bulk_upload(monkeypatch, tmp_path, insert_many)
+
+    response = post_two_pdfs()
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["filename"] for c in body["contracts"]] == ["first.pdf"]
+    assert body["failed"] == ["second.pdf"]
+
+    contract_id = body["contracts"][0]["contract_id"]
+    assert [call.args[0] for call in process_contract.await_args_list] == [contract_id]
+    assert os.listdir(tmp_path) == [f"{contract_id}.pdf"]
+
+def test_bulk_upload_removes_files_when_insert_fails(monkeypatch, tmp_path):
+    def insert_many(documents, ordered):
+        raise RuntimeError("database unavailable")
+
+    contracts, process_contract = mock_bulk_upload(monkeypatch, tmp_path, insert_many)
+
+    response = post_two_pdfs(TestClient(app, raise_server_exceptions=False))
+    assert response.status_code == 500
+    assert os.listdir(tmp_path) == []
+    contracts.delete_many.assert_awaited_once()
+    process_contract.assert_not_awaited()
+
 if __name__ == "__main__":
     test_health_check()
     print("Test completed successfully!")
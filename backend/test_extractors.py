@@ -0,0 +1,226 @@
+import asyncio
+import sys
+import os
+import time
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from app import contract_processor
+from app.contract_processor import (
+    ContractProcessor,
+    shutdown_extraction_pool,
+    _clean_extracted_text,
+    _payment_windows,
+    extract_parties,
+    extract_financial_details,
+    extract_payment_structure,
+    extract_revenue_classification,
+    extract_sla,
+    extract_account_info,
+)
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_contracts")
+
+def load_sample(name):
+    with open(os.path.join(SAMPLE_DIR, name), encoding="utf-8") as f:
+        return _clean_extracted_text(f.read())
+
+def test_service_agreement_sample():
+    text = load_sample("service_agreement_complete.txt")
+
+    names = [party["name"] for party in extract_parties(text)]
+    assert names[:2] == ["TechSolutions Inc.", "GlobalCorp Limited"]
+
+    financial = extract_financial_details(text)
+    assert financial["total_value"] == 210000.0
+    assert financial["currency"] == "USD"
+    assert len(financial["line_items"]) == 3
+
+    payment = extract_payment_structure(text)
+    assert payment["payment_terms"] == "Net 30 days"
+    assert sorted(payment["payment_methods"]) == ["ACH", "Credit Card", "Wire Transfer"]
+    assert payment["banking_details"] == "CUST-GC-2024-001"
+
+    revenue = extract_revenue_classification(text)
+    assert revenue["recurring_payments"] and revenue["one_time_payments"]
+    assert revenue["billing_cycle"] == "Monthly"
+
+    assert extract_sla(text)["performance_metrics"] == [
+        "99.9% uptime",
+        "uptime: 99.9%",
+        "Response time: Maximum 2 seconds",
+        "Support response: 1 hour",
+    ]
+
+    contact_info = extract_account_info(text)["contact_info"]
+    assert "billing@globalcorp.com" in contact_info["emails"]
+    assert contact_info["phones"][0] == "(555) 123-4567"
+
+def test_software_license_sample():
+    text = load_sample("software_license.txt")
+
+    names = [party["name"] for party in extract_parties(text)]
+    assert "Enterprise Solutions LLC" in names
+
+    financial = extract_financial_details(text)
+    assert financial["total_value"] == 10000.0
+    assert financial["currency"] == "USD"
+
+    payment = extract_payment_structure(text)
+    assert payment["payment_terms"] == "Net 15 days"
+    assert payment["payment_schedules"] == ["Monthly"]
+    # The bare "ach" keyword needs word boundaries, so "each month" is not ACH
+    assert sorted(payment["payment_methods"]) == ["Credit Card", "Wire Transfer"]
+    assert payment["banking_details"] is None
+
+def test_minimal_contract_sample():
+    text = load_sample("minimal_contract.txt")
+
+    assert extract_parties(text)[0]["name"] == "ABC Company"
+    assert extract_financial_details(text)["total_value"] == 500.0
+
+    payment = extract_payment_structure(text)
+    assert payment["payment_terms"] == "Net 30 days from invoice"
+    assert payment["payment_methods"] == []
+
+    assert extract_sla(text)["performance_metrics"] == []
+    assert extract_account_info(text)["contact_info"] == {}
+
+def test_banking_details_prefer_account_number_over_earlier_routing_number():
+    text = "Payment by wire. Routing Number: 021000021. Account Number: ACCT-778899. Banking details: First Bank"
+    assert extract_payment_structure(text)["banking_details"] == "ACCT-778899"
+
+def test_banking_details_prefer_routing_number_over_banking_clause():
+    text = "Banking details: First National Bank. Routing Number: 021000021."
+    assert extract_payment_structure(text)["banking_details"] == "021000021"
+
+def test_banking_details_fall_back_to_banking_clause():
+    text = "Invoices are paid to the bank below. Banking details: First National Bank of Springfield. Thanks."
+    assert extract_payment_structure(text)["banking_details"] == "First National Bank of Springfield"
+
+def test_payment_methods_from_list_and_keywords():
+    text = "Payment Methods: credit card, wire transfer or ACH. Customers may also pay via PayPal."
+    methods = extract_payment_structure(text)["payment_methods"]
+    assert sorted(methods) == ["ACH", "Credit Card", "PayPal", "Wire Transfer"]
+
+def test_method_keywords_inside_other_words_are_ignored():
+    assert extract_payment_structure("Fees are payable on the first of each month.")["payment_methods"] == []
+    assert extract_payment_structure("Follow the onboarding checklist.")["payment_methods"] == []
+    methods = extract_payment_structure("Fees may be paid by ACH or checks.")["payment_methods"]
+    assert sorted(methods) == ["ACH", "Check"]
+
+def test_schedules_and_due_dates_are_listed_by_pattern_then_position():
+    text = "Payments are made on a weekly basis. Invoicing quarterly. Monthly billing applies. Due 01/15/2025, payment due June 1, 2025."
+    payment = extract_payment_structure(text)
+    assert payment["payment_schedules"] == ["Monthly", "Quarterly", "Weekly"]
+    assert payment["due_dates"] == ["June 1, 2025", "01/15/2025"]
+
+def test_keyword_matches_keep_original_casing():
+    text = ("Terms: Net 45 Days. Billing is done Quarterly. Payment due March 15, 2025. "
+            "Fees exclude VAT: 20%. Account #: AB-1234. Service uptime: 99.5% guaranteed.")
+
+    payment = extract_payment_structure(text)
+    assert payment["payment_terms"] == "Net 45 Days"
+    assert payment["due_dates"] == ["March 15, 2025"]
+
+    assert extract_revenue_classification(text)["billing_cycle"] == "Quarterly"
+    assert extract_financial_details(text)["tax_info"] == "VAT: 20%"
+    assert "AB-1234" in extract_account_info(text)["account_numbers"]
+    assert extract_sla(text)["performance_metrics"] == ["uptime: 99.5%"]
+
+def test_uppercase_text_still_matches_keyword_patterns():
+    text = "PAYMENT METHODS: WIRE TRANSFER. UPTIME: 99.9%. TOTAL CONTRACT VALUE: USD 50,000."
+
+    assert extract_payment_structure(text)["payment_methods"] == ["Wire Transfer"]
+    assert extract_sla(text)["performance_metrics"] == ["UPTIME: 99.9%"]
+
+    financial = extract_financial_details(text)
+    assert financial["total_value"] == 50000.0
+    assert financial["currency"] == "USD"
+
+def test_total_indicator_near_amount_beats_larger_amount():
+    text = "A deposit of $900,000 is held in escrow by the bank for the full term of this agreement. The total due is $5,000."
+    assert extract_financial_details(text)["total_value"] == 5000.0
+
+def test_total_indicator_window_is_fifty_characters_after_amount():
+    # "sum" ends exactly 50 characters after the amount, so it counts
+    inside = "$2,000" + "x" * 200 + "$1,000" + "x" * 47 + "sum"
+    assert extract_financial_details(inside)["total_value"] == 1000.0
+
+    # One character further it no longer fits, so the largest amount is used
+    outside = "$2,000" + "x" * 200 + "$1,000" + "x" * 48 + "sum"
+    assert extract_financial_details(outside)["total_value"] == 2000.0
+
+def test_total_indicator_window_is_fifty_characters_before_amount():
+    inside = "total" + "x" * 45 + "$1,000" + "x" * 200 + "$2,000"
+    assert extract_financial_details(inside)["total_value"] == 1000.0
+
+    outside = "total" + "x" * 46 + "$1,000" + "x" * 200 + "$2,000"
+    assert extract_financial_details(outside)["total_value"] == 2000.0
+
+def test_payment_windows_are_clamped_and_merged():
+    text = b"pay" + b"x" * 300 + b"bank" + b"x" * 1000 + b"due"
+    assert _payment_windows(text) == [(0, 803), (len(text) - 103, len(text))]
+
+def test_payment_details_at_document_start():
+    text = "Payment Terms: Net 45 days via wire transfer. " + "General provisions apply. " * 40
+    payment = extract_payment_structure(text)
+    assert payment["payment_terms"] == "Net 45 days"
+    assert payment["payment_methods"] == ["Wire Transfer"]
+
+def test_payment_details_at_document_end():
+    text = "General provisions apply. " * 40 + "Payment within 15 days by credit card"
+    payment = extract_payment_structure(text)
+    assert payment["payment_terms"] == "Net 15 days"
+    assert payment["payment_methods"] == ["Credit Card"]
+
+def test_schedules_and_dates_far_from_payment_words():
+    text = ("Fees are billed monthly. "
+            + "The Provider shall deliver the services described in Schedule A with reasonable care and skill. " * 8
+            + "Reports are delivered on a quarterly basis. Effective date 01/15/2025.")
+    payment = extract_payment_structure(text)
+    assert payment["payment_schedules"] == ["Quarterly"]
+    assert payment["due_dates"] == ["01/15/2025"]
+
+def test_methods_and_banking_far_from_payment_words():
+    filler = "The Provider shall deliver the services described in Schedule A with reasonable care and skill. " * 8
+    payment = extract_payment_structure(filler + "Settlement by wire transfer. " + filler + "ABA #: 0210-22.")
+    assert payment["payment_methods"] == ["Wire Transfer"]
+    assert payment["banking_details"] == "0210-22"
+
+def test_payment_scan_stays_linear_on_long_documents():
+    # Hundreds of payment windows over ~1M characters; scanning each window
+    # must not cost the whole document again (this used to take seconds)
+    sample = " ".join(load_sample(name) for name in
+                      ("service_agreement_complete.txt", "software_license.txt", "minimal_contract.txt"))
+    text = " ".join([sample] * (1_000_000 // len(sample)))
+
+    started = time.perf_counter()
+    payment = extract_payment_structure(text)
+    assert time.perf_counter() - started < 2
+    assert payment["payment_terms"] == "Net 30 days"
+
+def extract_with_scan_cap(monkeypatch, text, cap):
+    monkeypatch.setattr(contract_processor, "_MAX_SCAN", cap)
+    monkeypatch.setattr(contract_processor.settings, "huggingface_api_key", None)
+
+    async def run():
+        processor = ContractProcessor()
+        try:
+            return await processor.extract_contract_data(text)
+        finally:
+            await processor.aclose()
+            shutdown_extraction_pool()
+
+    return asyncio.run(run())
+
+def test_total_beyond_scan_cap_is_found_in_remainder(monkeypatch):
+    text = "General provisions apply. " * 20 + "Total Contract Value: $480,000 USD."
+    financial = extract_with_scan_cap(monkeypatch, text, 200)["financial_details"]
+    assert financial["total_value"] == 480000.0
+    assert financial["currency"] == "USD"
+
+def test_total_within_scan_cap_skips_remainder(monkeypatch):
+    text = "Setup fee total: $1,000. " + "General provisions apply. " * 20 + "Total Contract Value: $480,000."
+    financial = extract_with_scan_cap(monkeypatch, text, 200)["financial_details"]
+    assert financial["total_value"] == 1000.0